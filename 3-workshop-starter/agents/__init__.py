@@ -5,5 +5,8 @@ Agents module for Travel Agent project.
 from .coordinator import travel_coordinator as coordinator
 from .participant import travel_participant as participant
 from .summarizer import summarizer
+from .llm import get_llm, invoke_llm, warm_up, prompt_cache_stats
+from .llm_cache import llm_cache_stats
 
-__all__ = ['coordinator', 'participant', 'summarizer']
\ No newline at end of file
+__all__ = ['coordinator', 'participant', 'summarizer', 'get_llm', 'invoke_llm', 'warm_up', 'prompt_cache_stats',
+           'llm_cache_stats']
\ No newline at end of file
@@ -0,0 +1,165 @@
+import math
+import os
+import threading
+
+from agents.summarizer import summarize_turns
+from agents.transcript import get_transcript, render_content
+from utils import debug
+
+
+# Approximate token budget for the conversation part of a prompt
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+# Always keep at least this many of the latest turns verbatim
+CONTEXT_MIN_RECENT = int(os.getenv("CONTEXT_MIN_RECENT", "6"))
+
+# After a compaction the verbatim turns use at most this share of the budget,
+# leaving headroom so the next compaction is several turns away
+COMPACT_TARGET = 0.5
+# Share of the budget the rolling summary may use
+SUMMARY_SHARE = 0.25
+
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def format_context(summary, recent_text):
+    """
+    Prompt block with the rolling summary (if any) followed by recent turns.
+    """
+    block = ""
+    if summary:
+        block += f"Summary of earlier conversation:\n{summary}\n\n"
+    block += f"Recent conversation:\n{recent_text}"
+    return block
+
+
+class ContextWindow:
+    """
+    Keeps a transcript-backed prompt context under a token budget.
+
+    The latest turns are kept verbatim. When they outgrow the budget, the
+    oldest ones are folded into a rolling summary in one batch, so the
+    summarizer only ever sees the summary so far plus the newly dropped turns.
+    Prompt size, and therefore per-turn latency, stays flat however long the
+    session runs.
+    """
+
+    def __init__(self, budget=CONTEXT_TOKEN_BUDGET, min_recent=CONTEXT_MIN_RECENT, summarize=summarize_turns):
+        """
+        Args:
+            budget: Approximate token budget for summary + recent turns
+            min_recent: Number of latest turns that are never folded
+            summarize: fn(previous_summary, new_turns, max_words) -> summary
+        """
+        self.budget = budget
+        self.min_recent = min_recent
+        self.summarize = summarize
+        self.summary = ""
+        self.folded = 0  # Turns [0, folded) live in the summary
+        self._cum_tokens = [0]  # _cum_tokens[i] = estimated tokens of turns [0, i)
+        self._lock = threading.Lock()
+        self._folding = False  # a caller is summarizing outside the lock
+        self._epoch = 0  # bumped when the transcript is rebuilt
+
+    def _sync_tokens(self, transcript):
+        n = len(transcript)
+        if n < len(self._cum_tokens) - 1 or n < self.folded:
+            # Transcript was rebuilt: start over
+            self.summary = ""
+            self.folded = 0
+            self._cum_tokens = [0]
+            self._epoch += 1
+
+        for line in transcript.lines(len(self._cum_tokens) - 1, n):
+            self._cum_tokens.append(self._cum_tokens[-1] + estimate_tokens(line))
+        return n
+
+    def _boundary(self, n):
+        """
+        Returns: End of the turns to fold into the summary, or None if the context fits
+        """
+        recent_tokens = self._cum_tokens[n] - self._cum_tokens[self.folded]
+        last_foldable = n - self.min_recent
+        if estimate_tokens(self.summary) + recent_tokens <= self.budget or self.folded >= last_foldable:
+            return None
+
+        target = int(self.budget * COMPACT_TARGET)
+        boundary = self.folded
+        while boundary < last_foldable and self._cum_tokens[n] - self._cum_tokens[boundary] > target:
+            boundary += 1
+        return boundary
+
+    def _summarize(self, summary, new_turns):
+        """
+        Returns: `summary` extended with `new_turns`
+        """
+        summary_tokens = int(self.budget * SUMMARY_SHARE)
+        try:
+            return self.summarize(summary, new_turns, max_words=int(summary_tokens * 0.75))
+        except Exception as e:
+            # Keep going without the LLM: retain the tail of the raw turns
+            debug(f"Summary compaction failed, truncating instead: {e}", "CONTEXT")
+            return (summary + "\n" + new_turns).strip()[-summary_tokens * 4:]
+
+    def build(self, transcript):
+        """
+        Returns: (summary, recent_text) for the prompt, compacting first if needed
+
+        The summarizer runs outside the lock, so agents sharing this window
+        are not blocked for an LLM round trip. While one caller folds, the
+        others build from the current summary.
+        """
+        with self._lock:
+            n = self._sync_tokens(transcript)
+            boundary = None if self._folding else self._boundary(n)
+            if boundary is None:
+                return self.summary, transcript.window(start=self.folded, end=n)
+            self._folding = True
+            epoch, start, previous = self._epoch, self.folded, self.summary
+            new_turns = transcript.window(start=start, end=boundary)
+
+        summary = None
+        try:
+            summary = self._summarize(previous, new_turns)
+        finally:
+            with self._lock:
+                self._folding = False
+                # Drop the result if the transcript was rebuilt meanwhile
+                if summary is not None and self._epoch == epoch:
+                    self.summary, self.folded = summary, boundary
+                    debug(f"Folded turns {start}-{boundary - 1} into summary", "CONTEXT")
+
+        with self._lock:
+            n = self._sync_tokens(transcript)
+            return self.summary, transcript.window(start=self.folded, end=n)
+
+
+def get_context(state, source="messages", render=render_content, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Budgeted prompt context for `state[source]`.
+
+    The ContextWindow is kept in state["context_windows"] next to the
+    session's transcripts, so the rolling summary is updated incrementally.
+
+    Args:
+        state: Current state
+        source: State key holding the message list
+        render: Function turning one message into a line of text
+        budget: Approximate token budget
+
+    Returns: Prompt block from format_context()
+    """
+    transcript = get_transcript(state, source, render)
+
+    windows = state.setdefault("context_windows", {})
+    key = f"{source}:{render.__name__}"
+    if key not in windows:
+        windows.setdefault(key, ContextWindow(budget=budget))
+    window = windows[key]
+
+    summary, recent_text = window.build(transcript)
+    return format_context(summary, recent_text)
@@ -1,7 +1,11 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
+from agents.llm import invoke_llm
+from agents.routing import route_without_llm, record_route
+from agents.context import get_context
 from utils import debug
+from tracing import traced
 from agents.participant import travel_participant
+from dispatch import CONCURRENT_DISPATCH, WORKER_AGENTS, pending_agents, run_concurrently
 
 
 def coordinator(state):
@@ -12,6 +16,7 @@ def coordinator(state):
     Updates state with:
     - next_speaker: Selected agent ID or "human"
     - volley_msg_left: Decremented counter
+    - routing_stats: How many decisions skipped the LLM ("fast_path") vs used it ("llm")
 
     Returns: Updated state
     """
@@ -27,12 +32,20 @@ def coordinator(state):
             "volley_msg_left": 0
         }
 
-    messages = state.get("messages", [])
+    # Skip the LLM round trip whenever the state already decides the speaker
+    selected_speaker = route_without_llm(state)
+    if selected_speaker:
+        routing_stats = record_route(state, fast_path=True)
+        debug(f"Fast-path selection: {selected_speaker} "
+              f"(LLM calls saved this session: {routing_stats['fast_path']})", "COORDINATOR")
+        return {
+            "next_speaker": selected_speaker,
+            "volley_msg_left": volley_left - 1,
+            "routing_stats": routing_stats
+        }
 
-    conversation_text = ""
-    for msg in messages:
-        # Messages are now always dicts
-        conversation_text += f"{msg.get('content', '')}\n"
+    # Recent messages verbatim, older ones as a rolling summary (token budgeted)
+    conversation_context = get_context(state, "messages")
 
     system_prompt = """You are managing a coordinated conversation between travel agency agents.
 
@@ -52,8 +65,7 @@ def coordinator(state):
     Respond with ONLY the speaker ID (planner, researcher, booker, or summarizer).
     """
 
-    user_prompt = f"""Recent conversation:
-{conversation_text}
+    user_prompt = f"""{conversation_context}
 
 Who should speak next to keep this kopitiam conversation lively?"""
 
@@ -61,12 +73,10 @@ Who should speak next to keep this kopitiam conversation lively?"""
 
     # Call LLM
     try:
-        llm = ChatOpenAI(model="gpt-5-nano", temperature=1)
-
-        response = llm.invoke([
+        response = invoke_llm([
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "gpt-5-nano", temperature=1, agent="coordinator")
 
         # Extract speaker from response
         if isinstance(response.content, list):
@@ -95,10 +105,12 @@ Who should speak next to keep this kopitiam conversation lively?"""
     # Return only the updates (LangGraph will merge with existing state)
     return {
         "next_speaker": selected_speaker,
-        "volley_msg_left": volley_left - 1
+        "volley_msg_left": volley_left - 1,
+        "routing_stats": record_route(state, fast_path=False)
     }
 
 
+@traced("node.coordinator")
 def travel_coordinator(state: dict) -> dict:
         """
         Simple coordinator for the travel planning workflow.
@@ -120,6 +132,7 @@ def travel_coordinator(state: dict) -> dict:
 
         # Default to planner when nothing else is scheduled
         next_agent = "planner"
+        next_agents = []
 
         if tasks:
                 # Find first pending task
@@ -127,24 +140,43 @@ def travel_coordinator(state: dict) -> dict:
                 if pending:
                         next_agent = pending[0].get("assigned_to", "planner")
 
+                # Every worker with an independent pending task can run in the same turn
+                if CONCURRENT_DISPATCH:
+                        next_agents = [a for a in pending_agents(state) if a in WORKER_AGENTS]
+
+        if len(next_agents) < 2:
+                next_agents = [next_agent]
+
         # Announce to message board so user can see coordinator action
         board.append({
                 "timestamp": __import__("datetime").datetime.now(),
                 "agent": "coordinator",
-                "content": f"Coordinator requests {next_agent} to begin their tasks.",
-                "payload": {"next_agent": next_agent}
+                "content": f"Coordinator requests {', '.join(next_agents)} to begin their tasks.",
+                "payload": {"next_agent": next_agent, "next_agents": next_agents}
         })
 
-        print(f"Coordinator selected next agent: {next_agent}")
+        print(f"Coordinator selected next agent: {', '.join(next_agents)}")
 
-        # Also ask the agent to post an initial 'thinking' message so the user can
+        # Also ask each agent to post an initial 'thinking' message so the user can
         # see both the coordinator instruction and the agent's initial trace.
-        try:
-            agent_updates = travel_participant(next_agent, {"message_board": board})
+        # Share the session's transcripts and rolling summaries so the board is
+        # rendered and summarized only once
+        context = {
+            "message_board": board,
+            "transcripts": state.setdefault("transcripts", {}),
+            "context_windows": state.setdefault("context_windows", {})
+        }
+
+        def think(agent):
+            try:
+                return travel_participant(agent, context)
+            except Exception as e:
+                debug(f"Error calling travel_participant: {e}", "COORDINATOR")
+                return None
+
+        for agent_updates in run_concurrently(think, next_agents):
             # travel_participant returns {"message_board": board}
             if agent_updates and "message_board" in agent_updates:
                 board = agent_updates["message_board"]
-        except Exception as e:
-            debug(f"Error calling travel_participant: {e}", "COORDINATOR")
 
-        return {"next_agent": next_agent, "message_board": board}
+        return {"next_agent": next_agent, "next_agents": next_agents, "message_board": board}
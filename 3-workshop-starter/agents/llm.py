@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+
+from langchain_openai import ChatOpenAI
+from agents.llm_cache import LLM_CACHE_BYPASS, cache_key, get_llm_cache
+from agents.streaming import current_sink, stream_response
+from record_replay import get_session_trace
+from metrics import record_llm_call
+from tracing import span
+from utils import debug
+
+
+# Models used by the agents package: (model, temperature)
+AGENT_MODELS = [
+    ("gpt-5-nano", 1),    # coordinator, summarizer
+    ("gpt-5-mini", 0.7)   # travel_participant
+]
+
+# Open the API connection at startup so the first turn doesn't pay for it
+LLM_WARMUP = os.getenv("LLM_WARMUP", "true").lower() == "true"
+
+_clients = {}  # (model, temperature) -> ChatOpenAI
+_lock = threading.Lock()
+
+
+def get_llm(model, temperature=1):
+    """
+    Returns a long-lived ChatOpenAI client for (model, temperature).
+
+    Clients are created once per process and shared between agents and
+    threads, so every call reuses the same HTTP connection pool.
+
+    Args:
+        model: OpenAI model name, e.g. "gpt-5-nano"
+        temperature: Sampling temperature
+
+    Returns: ChatOpenAI instance
+    """
+    key = (model, temperature)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is None:
+            # stream_usage: token counts are also reported for streamed calls
+            llm = ChatOpenAI(model=model, temperature=temperature, stream_usage=True)
+            _clients[key] = llm
+        return llm
+
+
+def warm_up(models=None, background=True):
+    """
+    Create the agents' clients and open their API connections ahead of time.
+
+    Sends a lightweight models.list() request per client (no tokens used).
+    Failures are only logged, so a missing API key doesn't stop startup.
+    Skipped when replaying a recorded session (RECORD_MODE=replay).
+
+    Args:
+        models: List of (model, temperature); defaults to AGENT_MODELS
+        background: Run in a daemon thread instead of blocking the caller
+
+    Returns: The warm-up thread when background is True, else None
+    """
+    trace = get_session_trace()
+    if trace and trace.replaying:
+        return None
+
+    models = models or AGENT_MODELS
+
+    def run():
+        for model, temperature in models:
+            try:
+                get_llm(model, temperature).root_client.models.list()
+                debug(f"Warmed up {model} (temperature={temperature})", "LLM")
+            except Exception as e:
+                debug(f"Warm-up failed for {model}: {e}", "LLM")
+
+    if not background:
+        run()
+        return None
+
+    thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+_usage_lock = threading.Lock()
+_prompt_cache_stats = {}  # agent -> {"calls", "prompt_tokens", "cached_tokens"}
+
+
+def usage_from_response(response):
+    """
+    Token usage of a chat response.
+
+    Reads the standard `usage_metadata`, falling back to the raw OpenAI
+    `token_usage` in response_metadata.
+
+    Returns: Dict with prompt_tokens, cached_tokens, completion_tokens
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage:
+        return {
+            "prompt_tokens": usage.get("input_tokens", 0),
+            "cached_tokens": (usage.get("input_token_details") or {}).get("cache_read", 0) or 0,
+            "completion_tokens": usage.get("output_tokens", 0)
+        }
+
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    return {
+        "prompt_tokens": token_usage.get("prompt_tokens", 0),
+        "cached_tokens": (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0,
+        "completion_tokens": token_usage.get("completion_tokens", 0)
+    }
+
+
+def _invoke(messages, model, temperature, agent, cache, sink=None):
+    """
+    Get a response from the recorded trace, the response cache or the API.
+
+    API calls stream to `sink` when one is given. Replayed and cached
+    responses are passed to it in one piece.
+
+    Returns: (AIMessage, source, ttft) where source is "replay", "cache" or
+    "api" and ttft is the seconds to the first token (None when not streamed)
+    """
+    trace = get_session_trace()
+    llm_cache = get_llm_cache() if cache else None
+    key = cache_key(model, temperature, messages) if (llm_cache or trace) else None
+    start = time.perf_counter()
+    ttft = None
+
+    if trace and trace.replaying:
+        response, source = trace.replay_llm(key, agent), "replay"
+    else:
+        source = "cache"
+        response = llm_cache.get(key, agent) if (llm_cache and not LLM_CACHE_BYPASS) else None
+
+        if response is None:
+            source = "api"
+            if sink:
+                response, ttft = stream_response(get_llm(model, temperature), messages, agent, sink)
+            else:
+                response = get_llm(model, temperature).invoke(messages)
+            if llm_cache and response.content:
+                llm_cache.put(key, response, agent)
+
+        if trace:
+            trace.record_llm(key, model, temperature, agent, response, time.perf_counter() - start)
+
+    if sink and ttft is None:
+        ttft = time.perf_counter() - start
+        if response.content:
+            sink.token(agent, response.content if isinstance(response.content, str) else str(response.content))
+
+    return response, source, ttft
+
+
+def invoke_llm(messages, model, temperature=1, agent="unknown", cache=True, stream=False):
+    """
+    Invoke a shared client and record how much of the prompt hit the provider's prefix cache.
+
+    Tokens, latency and cost are also added to the running session's metrics
+    (see metrics.py).
+
+    When the on-disk response cache is enabled (LLM_CACHE=true), identical
+    (model, temperature, messages) calls are answered from it. With
+    RECORD_MODE=record every response is appended to the trace file; with
+    RECORD_MODE=replay responses come from that file and the API is never called.
+
+    Args:
+        messages: List of LangChain messages
+        model: OpenAI model name
+        temperature: Sampling temperature
+        agent: Name used to group usage statistics
+        cache: Set False to bypass the response cache for this call
+        stream: Stream tokens to the bound TokenSink, if any (see agents/streaming.py)
+
+    Returns: The model's AIMessage (assembled from the chunks when streamed)
+    """
+    sink = current_sink() if stream else None
+
+    with span("llm", model=model, agent=agent) as llm_span:
+        start = time.perf_counter()
+        response, source, ttft = _invoke(messages, model, temperature, agent, cache, sink)
+        latency = time.perf_counter() - start
+        usage = usage_from_response(response)
+        llm_span.set(source=source, **usage)
+        if ttft is not None:
+            llm_span.set(ttft_s=ttft)
+
+    if sink:
+        sink.done(agent, ttft, latency)
+        debug(f"{agent}: first token {ttft:.2f}s, total {latency:.2f}s", "LLM")
+
+    # Per-agent tokens, latency and cost for the current session (state["metrics"])
+    record_llm_call(agent, model, usage, latency, source, ttft)
+
+    if source == "cache":
+        debug(f"{agent}: response cache hit", "LLM")
+        return response
+
+    prompt_tokens, cached_tokens = usage["prompt_tokens"], usage["cached_tokens"]
+    debug(f"{agent}: prompt tokens {prompt_tokens} "
+          f"(cached {cached_tokens}, uncached {prompt_tokens - cached_tokens})", "LLM")
+
+    with _usage_lock:
+        stats = _prompt_cache_stats.setdefault(agent, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+        stats["calls"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+
+    return response
+
+
+def prompt_cache_stats():
+    """
+    Returns: Per-agent calls, prompt tokens and cached prompt tokens so far
+    """
+    with _usage_lock:
+        return {agent: dict(stats) for agent, stats in _prompt_cache_stats.items()}
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain.schema import AIMessage
+
+
+# Optional on-disk cache in front of every agent LLM call
+LLM_CACHE = os.getenv("LLM_CACHE", "false").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite3")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # seconds
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "50"))
+# Skip lookups (fresh responses still overwrite the stored ones)
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+
+def cache_key(model, temperature, messages):
+    """
+    Stable hash of (model, temperature, messages).
+    """
+    payload = json.dumps(
+        [model, temperature, [[m.type, m.content] for m in messages]],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache with a TTL and size-based LRU eviction.
+
+    Entries are keyed by cache_key(). Reads refresh an entry's access time.
+    When the stored responses exceed `max_bytes`, the least recently used
+    entries are deleted. Hit and miss counts are kept per agent.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {}  # agent -> {"hits", "misses"}
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " agent TEXT,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _count(self, agent, outcome):
+        stats = self._stats.setdefault(agent, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def get(self, key, agent="unknown"):
+        """
+        Returns: Cached AIMessage, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, size, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[2] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= row[1]
+                row = None
+
+            if row is None:
+                self._count(agent, "misses")
+                return None
+
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._count(agent, "hits")
+
+        data = json.loads(row[0])
+        return AIMessage(
+            content=data["content"],
+            response_metadata={**data.get("response_metadata", {}), "cache": "hit"}
+        )
+
+    def put(self, key, response, agent="unknown"):
+        """
+        Store a response and evict least recently used entries over the size limit.
+        """
+        text = json.dumps({
+            "content": response.content,
+            "response_metadata": getattr(response, "response_metadata", None) or {}
+        }, ensure_ascii=False, default=str)
+        size = len(text.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, response, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, agent, text, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        Delete least recently used entries until under max_bytes. Caller holds the lock.
+        """
+        freed, victims = 0, []
+        overflow = self._total_bytes - self.max_bytes
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed ASC"):
+            if freed >= overflow:
+                break
+            victims.append((key,))
+            freed += size
+
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._total_bytes -= freed
+
+    def stats(self):
+        """
+        Returns: Per-agent hits, misses and hit_rate
+        """
+        with self._lock:
+            return {
+                agent: {**counts, "hit_rate": counts["hits"] / max(1, counts["hits"] + counts["misses"])}
+                for agent, counts in self._stats.items()
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Returns: The process-wide LLMCache, or None when LLM_CACHE is off
+    """
+    global _cache
+    if not LLM_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+def llm_cache_stats():
+    """
+    Returns: Per-agent cache hit rates ({} when the cache is off)
+    """
+    cache = get_llm_cache()
+    return cache.stats() if cache else {}
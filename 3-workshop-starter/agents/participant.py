@@ -1,6 +1,8 @@
 from tools import singapore_time, singapore_weather, singapore_news
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
+from agents.llm import invoke_llm
+from agents.context import get_context
+from agents.transcript import render_agent_line
 from utils import debug
 import re
 
@@ -225,6 +227,23 @@ TRAVEL_AGENTS = {
     }
 }
 
+# Identical for every persona and every turn. Keep per-call values out of it.
+TRAVEL_REACT_PROMPT = """You are one process in a multi-agent travel planning system.
+Your persona is described at the end of the prompt, after the conversation.
+
+You operate in a Thought -> Action -> Observation loop. At the end of the loop output either:
+- Message: <short 1-2 sentence reply>
+OR
+- Action: <tool>[: optional query]
+
+Available tools the orchestrator can run: time, weather, news, attractions, etc.
+If you emit Action, the orchestrator will run the tool and call you again with:
+Observation: <tool output>
+
+Do NOT fabricate tool outputs. Keep messages concise and on-task.
+"""
+
+
 def travel_participant(persona_id, state):
     """
     Orchestrator-facing participant. Does NOT call a separate `participant` helper.
@@ -240,40 +259,26 @@ def travel_participant(persona_id, state):
     debug(f"\n=== {persona['name']} is thinking... ===")
 
     # Build recent conversation context (prefer message_board then messages)
-    messages = state.get("message_board") or state.get("messages") or []
-    conversation_text = ""
-    for msg in messages:
-        # msg may be dict with agent/content or raw string
-        if isinstance(msg, dict):
-            conversation_text += f"{msg.get('agent','user')}: {msg.get('content','')}\n"
-        else:
-            conversation_text += f"{str(msg)}\n"
-
-    system_prompt = f"""You are the {persona['name']} process in a travel planning system.
+    # Older turns are folded into a rolling summary to stay within the token budget
+    source = "message_board" if state.get("message_board") else "messages"
+    conversation_context = get_context(state, source, render_agent_line)
+
+    # Stable parts first: the static ReAct rules, then the conversation
+    # (append-only between compactions, shared by all personas), and the
+    # persona-specific instruction last.
+    prompt = [
+        SystemMessage(content=TRAVEL_REACT_PROMPT),
+        HumanMessage(content=conversation_context),
+        HumanMessage(content=f"""You are the {persona['name']} process.
 Background: {persona['backstory']}
 Personality: {persona['personality']}
 Speech style: {persona['speech_style']}
 
-You operate in a Thought -> Action -> Observation loop. At the end of the loop output either:
-- Message: <short 1-2 sentence reply>
-OR
-- Action: <tool>[: optional query]
-
-Available tools the orchestrator can run: time, weather, news, attractions, etc.
-If you emit Action, the orchestrator will run the tool and call you again with:
-Observation: <tool output>
-
-Do NOT fabricate tool outputs. Keep messages concise and on-task.
-"""
-
-    user_prompt = f"Recent conversation:\n{conversation_text}\n\nAs the {persona['name']}, respond with Thought/Action/Message as appropriate."
+As the {persona['name']}, respond with Thought/Action/Message as appropriate.""")
+    ]
 
     try:
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0.7)
-        resp = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ])
+        resp = invoke_llm(prompt, "gpt-5-mini", temperature=0.7, agent=persona_id, stream=True)
         content = resp.content.strip()
         debug(f"LLM Response for {persona_id}:\n{content}\n")
 
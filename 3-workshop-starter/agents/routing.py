@@ -0,0 +1,60 @@
+from typing import Optional
+
+
+VALID_SPEAKERS = ["planner", "researcher", "booker", "summarizer"]
+
+
+def route_without_llm(state) -> Optional[str]:
+    """
+    Pick the next speaker from the task state alone when the choice is unambiguous.
+
+    Rules, in order:
+    - An error or the summary phase -> summarizer
+    - Shared state exists but no tasks have been created yet -> planner
+    - Pending tasks -> whoever owns the first pending task
+    - Every task completed -> summarizer
+
+    Free-text messages are left to the model: a mention of a speaker
+    ("don't involve the booker yet") is not a request for them.
+
+    Args:
+        state: Current conversation state
+
+    Returns: Speaker ID, or None when the model should decide
+    """
+    if state.get("error") or state.get("phase") == "summary":
+        return "summarizer"
+
+    shared = state.get("shared_state")
+    if shared is not None:
+        tasks = shared.get("tasks") or []
+        task_status = shared.get("task_status", {})
+
+        if not tasks:
+            return "planner"
+
+        statuses = [task_status.get(t["id"], {}).get("status") for t in tasks]
+
+        for task, status in zip(tasks, statuses):
+            if status == "pending" and task.get("assigned_to") in VALID_SPEAKERS:
+                return task["assigned_to"]
+
+        if all(status == "completed" for status in statuses):
+            return "summarizer"
+
+    return None
+
+
+def record_route(state, fast_path):
+    """
+    Count one routing decision for this session.
+
+    Args:
+        state: Current conversation state
+        fast_path: True if the decision skipped the LLM
+
+    Returns: Updated routing_stats dict ({"fast_path": n, "llm": m})
+    """
+    stats = dict(state.get("routing_stats") or {"fast_path": 0, "llm": 0})
+    stats["fast_path" if fast_path else "llm"] += 1
+    return stats
@@ -0,0 +1,121 @@
+"""
+Token streaming for LLM calls made with invoke_llm(..., stream=True).
+
+Bind a TokenSink around any code that calls the agents; calls that opted in
+then stream their tokens to it as they arrive and still return the assembled
+message. Without a bound sink, those calls run as a normal single request.
+
+    with token_sink(TerminalPrinter()):
+        run_session(state)
+
+The sink follows the caller into dispatch.run_concurrently workers, so
+concurrent agents stream to the same sink (tokens carry the agent name).
+"""
+
+import contextvars
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from langchain.schema import AIMessage
+
+
+# Stream agent messages to the terminal in main.py
+LLM_STREAM = os.getenv("LLM_STREAM", "false").lower() == "true"
+
+_current_sink = contextvars.ContextVar("token_sink", default=None)
+
+
+class TokenSink:
+    """
+    Receives streamed tokens. Subclass and override either method.
+    """
+
+    def token(self, agent, text):
+        """Called for every chunk of text, in order, as it arrives."""
+
+    def done(self, agent, ttft, latency):
+        """Called once the message is complete, with seconds to first token and in total."""
+
+
+class TerminalPrinter(TokenSink):
+    """
+    Prints tokens as they arrive, prefixed by the agent whenever the speaker changes.
+    """
+
+    def __init__(self, out=None):
+        self.out = out
+        self._lock = threading.Lock()
+        self._last_agent = None
+
+    def token(self, agent, text):
+        out = self.out or sys.stdout
+        with self._lock:
+            if agent != self._last_agent:
+                out.write(f"\n[{agent}] ")
+                self._last_agent = agent
+            out.write(text)
+            out.flush()
+
+    def done(self, agent, ttft, latency):
+        out = self.out or sys.stdout
+        with self._lock:
+            out.write(f"\n[{agent}] first token {ttft:.2f}s, total {latency:.2f}s\n")
+            out.flush()
+            self._last_agent = None
+
+
+@contextmanager
+def token_sink(sink):
+    """
+    Stream opted-in LLM calls made inside the block to `sink`.
+    """
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _current_sink.reset(token)
+
+
+def current_sink():
+    """
+    Returns: The bound TokenSink, or None
+    """
+    return _current_sink.get()
+
+
+def _text(content):
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    return content or ""
+
+
+def stream_response(llm, messages, agent, sink):
+    """
+    Stream a chat completion to `sink` and assemble the final message.
+
+    Returns: (AIMessage, seconds to first token)
+    """
+    start = time.perf_counter()
+    ttft = None
+    full = None
+
+    for chunk in llm.stream(messages):
+        text = _text(chunk.content)
+        if text:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            sink.token(agent, text)
+        full = chunk if full is None else full + chunk
+
+    if full is None:
+        return AIMessage(content=""), time.perf_counter() - start
+
+    response = AIMessage(
+        content=full.content,
+        usage_metadata=full.usage_metadata,
+        response_metadata=full.response_metadata
+    )
+    return response, ttft if ttft is not None else time.perf_counter() - start
@@ -1,5 +1,6 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
+from agents.llm import invoke_llm
+from agents.transcript import get_transcript
 
 
 def summarizer(state) -> str:
@@ -18,10 +19,7 @@ def summarizer(state) -> str:
         return "No conversation to summarize."
 
     # Extract conversation text
-    conversation_text = ""
-    for msg in messages:
-        # Messages are now always dicts
-        conversation_text += f"{msg.get('content', '')}\n"
+    conversation_text = get_transcript(state, "messages").text
 
     if not conversation_text.strip():
         return "No conversation content to summarize."
@@ -46,12 +44,10 @@ Please provide a summary of this kopitiam conversation."""
 
     try:
         # Call LLM
-        llm = ChatOpenAI(model="gpt-5-nano", temperature=1)
-
-        response = llm.invoke([
+        response = invoke_llm([
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "gpt-5-nano", temperature=1, agent="summarizer", stream=True)
 
         if isinstance(response.content, list):
             summary = " ".join(str(item) for item in response.content).strip()
@@ -69,3 +65,46 @@ Total messages: {len(messages)}
 
 Unable to generate detailed summary at this time.
 The conversation has been logged for review."""
+
+
+def summarize_turns(previous_summary, new_turns, max_words=150) -> str:
+    """
+    Fold older conversation turns into a running summary.
+
+    Used by agents/context.py to compact long sessions: only the turns that
+    have just dropped out of the verbatim window are sent, together with the
+    summary so far.
+
+    Args:
+        previous_summary: Summary of everything folded earlier ("" at first)
+        new_turns: Rendered turns to fold in
+        max_words: Upper bound for the updated summary
+
+    Returns:
+        Updated summary string (raises if the LLM call fails)
+    """
+    # Static system prompt so it stays in the provider's prefix cache
+    system_prompt = """You maintain a running summary of a multi-agent travel planning conversation.
+
+Merge the new turns into the existing summary. Keep facts that later turns may need:
+destinations, dates, guests, tasks and who owns them, task status, tool results,
+bookings and decisions. Drop greetings and repeated status chatter.
+
+Respond with ONLY the updated summary."""
+
+    user_prompt = f"""Existing summary:
+{previous_summary or "(none yet)"}
+
+New turns:
+{new_turns}
+
+Keep the updated summary under {max_words} words."""
+
+    response = invoke_llm([
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt)
+    ], "gpt-5-nano", temperature=1, agent="context_summary")
+
+    if isinstance(response.content, list):
+        return " ".join(str(item) for item in response.content).strip()
+    return str(response.content).strip()
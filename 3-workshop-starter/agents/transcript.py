@@ -0,0 +1,151 @@
+import threading
+from bisect import bisect_left
+
+
+def render_content(msg):
+    """
+    Render a message as its content only (coordinator / summarizer style).
+    """
+    return f"{msg.get('content', '')}\n"
+
+
+def render_agent_line(msg):
+    """
+    Render a message as "agent: content" (message board style).
+    """
+    # msg may be dict with agent/content or raw string
+    if isinstance(msg, dict):
+        return f"{msg.get('agent','user')}: {msg.get('content','')}\n"
+    return f"{str(msg)}\n"
+
+
+class Transcript:
+    """
+    Append-only rendered view of a message list.
+
+    Each message is rendered once when it is first seen. The full text is
+    cached until the next append, and windowed views only join the lines they
+    return, so building a prompt no longer re-renders the whole history.
+    """
+
+    def __init__(self, render=render_content):
+        self._render = render
+        self._lines = []
+        self._ends = []  # _ends[i] = total characters up to and including line i
+        self._text = ""
+        self._text_valid = True
+        self._seen = 0
+        self._last = None  # last message rendered, to detect a replaced list
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def append(self, msg):
+        """
+        Render and append a single message.
+        """
+        with self._lock:
+            self._append(msg)
+
+    def _append(self, msg):
+        line = self._render(msg)
+        self._lines.append(line)
+        self._ends.append((self._ends[-1] if self._ends else 0) + len(line))
+        self._text_valid = False
+        self._seen += 1
+        self._last = msg
+
+    def _reset(self):
+        self._lines = []
+        self._ends = []
+        self._text = ""
+        self._text_valid = True
+        self._seen = 0
+        self._last = None
+
+    def sync(self, messages):
+        """
+        Append any messages from `messages` that have not been rendered yet.
+
+        Messages are assumed to be appended only. If the list was replaced or
+        rewritten the transcript is rebuilt from scratch.
+
+        Returns: self, for chaining
+        """
+        with self._lock:
+            seen = self._seen
+            if len(messages) < seen or (seen and messages[seen - 1] is not self._last):
+                self._reset()
+                seen = 0
+
+            for msg in messages[seen:]:
+                self._append(msg)
+        return self
+
+    @property
+    def text(self):
+        """
+        Full rendered transcript.
+        """
+        with self._lock:
+            if not self._text_valid:
+                self._text = "".join(self._lines)
+                self._text_valid = True
+            return self._text
+
+    def window(self, last_n=None, max_chars=None, start=0, end=None):
+        """
+        Rendered text of the most recent messages.
+
+        Args:
+            last_n: Keep at most this many messages
+            max_chars: Keep at most this many characters (whole messages only)
+            start: Index of the first message that may be included
+            end: Index one past the last message (default: latest message)
+
+        Returns: Rendered text of the selected messages
+        """
+        with self._lock:
+            end = len(self._lines) if end is None else min(end, len(self._lines))
+            if last_n is not None:
+                start = max(start, end - last_n)
+
+            if max_chars is not None and end > start:
+                # First line i such that lines[i:end] fit in max_chars, always
+                # keeping at least the latest message
+                overflow = self._ends[end - 1] - max_chars
+                first_fit = bisect_left(self._ends, overflow, 0, end) + 1 if overflow > 0 else 0
+                start = max(start, min(first_fit, end - 1))
+
+            if start == 0 and end == len(self._lines) and self._text_valid:
+                return self._text
+            return "".join(self._lines[start:end])
+
+    def lines(self, start=0, end=None):
+        """
+        Returns: Copy of the rendered lines in [start, end)
+        """
+        with self._lock:
+            return self._lines[start:end]
+
+
+def get_transcript(state, source="messages", render=render_content):
+    """
+    Return the transcript kept alongside `state` for `state[source]`, synced.
+
+    Transcripts are stored in state["transcripts"] keyed by source and
+    renderer, so each message is rendered once per session.
+
+    Args:
+        state: Current state (a "transcripts" dict is added if missing)
+        source: State key holding the message list
+        render: Function turning one message into a line of text
+
+    Returns: Transcript
+    """
+    transcripts = state.setdefault("transcripts", {})
+    key = f"{source}:{render.__name__}"
+    if key not in transcripts:
+        transcripts.setdefault(key, Transcript(render))
+    return transcripts[key].sync(state.get(source) or [])
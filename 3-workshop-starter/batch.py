@@ -0,0 +1,155 @@
+"""
+Headless batch planner: plan many trips from a JSONL file of TravelRequests.
+
+Each input line is a JSON object with destination, check_in, check_out, guests
+and optional preferences. Requests are planned concurrently and one result
+line is written as soon as each trip finishes, so output order follows
+completion order; use the "index" field (0-based input line) to match
+results to requests. Run from the project root:
+
+    python batch.py requests.jsonl -o itineraries.jsonl --workers 8
+    cat requests.jsonl | python batch.py > itineraries.jsonl
+
+Only `--workers x 2` requests are read ahead of the workers, so memory stays
+bounded however large the input is. Session output is discarded unless
+--verbose is given, in which case it goes to stderr.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+# Before the project imports, which read their settings at import time
+load_dotenv(override=True)
+
+from nodes import initial_state  # noqa: E402
+from main import run_session  # noqa: E402
+
+
+REQUIRED_FIELDS = ("destination", "check_in", "check_out", "guests")
+
+
+def parse_request(line):
+    """
+    Returns: TravelRequest dict (raises ValueError on bad JSON or missing fields)
+    """
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+
+    missing = [field for field in REQUIRED_FIELDS if field not in request]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    return request
+
+
+def plan_trip(index, line):
+    """
+    Plan one trip from an input line.
+
+    Returns: Result dict for the output JSONL
+    """
+    start = time.perf_counter()
+    result = {"index": index, "status": "error"}
+
+    try:
+        request = parse_request(line)
+        result["request"] = request
+
+        state = run_session(initial_state(request), on_board_entry=lambda entry: None)
+        shared = state["shared_state"]
+
+        result.update({
+            "status": "ok" if shared.get("itinerary") else "error",
+            "itinerary": shared.get("itinerary"),
+            "bookings": shared.get("bookings", []),
+            "error": state.get("error") or (None if shared.get("itinerary") else "Planning incomplete"),
+            "usage": state["metrics"]["totals"]
+        })
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(lines, out, workers=4):
+    """
+    Plan every request from `lines` and write results to `out` as they finish.
+
+    Args:
+        lines: Iterable of JSONL input lines (read lazily)
+        out: Text stream for the result JSONL
+        workers: Number of trips planned at the same time
+
+    Returns:
+        (planned, failed) counts
+    """
+    max_pending = workers * 2
+    planned = failed = 0
+
+    def write(future):
+        nonlocal planned, failed
+        result = future.result()
+        out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        out.flush()
+        planned += 1
+        failed += result["status"] != "ok"
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+        pending = set()
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+
+            # Bounded read-ahead: wait for a slot before taking the next request
+            while len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future)
+
+            pending.add(pool.submit(plan_trip, index, line))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                write(future)
+
+    return planned, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="JSONL of TravelRequests ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="result JSONL ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", "4")))
+    parser.add_argument("--verbose", action="store_true", help="show session output on stderr")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input, encoding="utf-8"))
+        out = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+
+        # Nodes print progress; keep it off the result stream
+        session_output = sys.stderr if args.verbose else stack.enter_context(open(os.devnull, "w"))
+        stack.enter_context(contextlib.redirect_stdout(session_output))
+
+        start = time.perf_counter()
+        planned, failed = run_batch(source, out, args.workers)
+        elapsed = time.perf_counter() - start
+
+    print(f"Planned {planned} trips ({failed} failed) in {elapsed:.1f}s "
+          f"with {args.workers} workers", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Travel Agent project. Run each module from the project root,
+e.g. `python -m benchmarks.news_parser`.
+"""
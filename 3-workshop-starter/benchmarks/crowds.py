@@ -0,0 +1,102 @@
+"""
+Allocation benchmark: lazy crowd forecasts vs the eager per-day dicts.
+
+Replays the memory side of one research task: search a 1,000-POI catalog,
+store the attractions in the shared state (results, task status and a board
+payload, as researcher_node does), then deep-copy the shared state once per
+concurrent turn, as dispatch does for every agent snapshot. Eager mode rebuilds the old
+7-day list of dicts for every attraction. Lazy mode keeps the CrowdForecast
+that search_attractions now returns, covering the trip's dates. Reports the
+memory held and the peak measured with tracemalloc, and the time per task.
+Run from the project root:
+
+    python -m benchmarks.crowds [--top-n 5 50] [--nights 3 14] [--turns 6]
+"""
+
+import argparse
+import copy
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.spatial import make_catalog
+from tools.attractions import CITY_CENTERS, register_attractions, search_attractions
+
+
+TASKS = 50
+CITY = "crowdville"
+
+
+def eager_forecast():
+    """
+    Reference: the fixed-week forecast search_attractions used to build.
+    """
+    now = datetime.now()
+    forecast = []
+    for i in range(7):
+        day = now + timedelta(days=i)
+        forecast.append({
+            "date": day.strftime("%Y-%m-%d"),
+            "crowd_level": random.choice(["low", "medium", "high"]),
+            "best_time": random.choice(["morning", "afternoon", "evening"])
+        })
+    return forecast
+
+
+def research_task(top_n, nights, turns, eager):
+    start = datetime(2026, 11, 1)
+    attractions = search_attractions(
+        CITY, radius_km=50, top_n=top_n,
+        start_date=start.strftime("%Y-%m-%d"),
+        end_date=(start + timedelta(days=nights)).strftime("%Y-%m-%d")
+    )
+    if eager:
+        for attraction in attractions:
+            attraction["crowd_forecast"] = eager_forecast()
+
+    result = {"attractions": attractions, "weather": None}
+    shared = {
+        "results": dict(result),
+        "task_status": {"research": {"status": "completed", "result": result}},
+        "board": [{"agent": "researcher", "payload": result}]
+    }
+    # Every later concurrent turn snapshots the shared state per agent
+    snapshots = [copy.deepcopy(shared) for _ in range(turns)]
+    return shared, snapshots
+
+
+def measure(top_n, nights, turns, eager):
+    research_task(top_n, nights, turns, eager)  # warm up caches and the index
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [research_task(top_n, nights, turns, eager) for _ in range(TASKS)]
+    elapsed = (time.perf_counter() - start) / TASKS
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / TASKS, peak / TASKS, elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top-n", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--nights", type=int, nargs="+", default=[3, 14])
+    parser.add_argument("--turns", type=int, default=6, help="dispatch snapshots per task")
+    args = parser.parse_args()
+
+    register_attractions(CITY, make_catalog(1000, CITY_CENTERS["kyoto"], random.Random(42)))
+    print(f"{TASKS} research tasks per case, {args.turns} shared-state snapshots each\n")
+    print(f"{'top_n':>6} {'nights':>7} {'mode':>6} {'held KB':>9} {'peak KB':>9} {'ms/task':>8}")
+    for top_n in args.top_n:
+        for nights in args.nights:
+            rows = {mode: measure(top_n, nights, args.turns, mode == "eager") for mode in ("eager", "lazy")}
+            for mode, (held, peak, ms) in rows.items():
+                print(f"{top_n:>6} {nights:>7} {mode:>6} {held / 1024:>9.1f} {peak / 1024:>9.1f} {ms:>8.3f}")
+            saved = 1 - rows["lazy"][0] / rows["eager"][0]
+            print(f"{'':>6} {'':>7} {'':>6} {saved:>9.0%} less memory held per task\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Scaling benchmark: vectorized hotel quotes vs pricing hotels one at a time.
+
+Registers synthetic hotel catalogs of increasing size and times
+quote_hotels() (filter, price and rank every hotel in one call) next to a
+plain Python loop that prices each hotel separately, as N book_hotel-style
+calls would. Every vectorized answer is checked against the loop. Run from
+the project root:
+
+    python -m benchmarks.hotel_quotes [--sizes 1000 10000 100000] [--queries 50]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from tools.hotel_catalog import BASE_PRICES, base_price, stay_price
+from tools.hotels import get_hotel_catalog, get_inventory, quote_hotels, register_hotels
+
+
+CITY = "benchville"
+AMENITIES = ["spa", "pool", "restaurant", "bar", "fitness-center", "laundry", "parking", "wifi"]
+RANGES = list(BASE_PRICES) + ["budget"]
+NIGHTS = 4
+CHECK_IN = (date.today() + timedelta(days=30)).isoformat()
+CHECK_OUT = (date.today() + timedelta(days=30 + NIGHTS)).isoformat()
+
+
+def make_hotels(size, rng):
+    return [
+        {
+            "id": f"H{i:06d}",
+            "name": f"Hotel {i}",
+            "rating": rng.randint(1, 5),
+            "lat": 35.0 + rng.uniform(-0.1, 0.1),
+            "lon": 135.7 + rng.uniform(-0.1, 0.1),
+            "amenities": rng.sample(AMENITIES, rng.randint(1, 5)),
+            "price_range": rng.choice(RANGES),
+            "rooms": rng.randint(10, 200)
+        }
+        for i in range(size)
+    ]
+
+
+def make_filters(rng):
+    filters = {"sort_by": rng.choice(("price", "rating")), "top_n": 20}
+    if rng.random() < 0.5:
+        filters["min_rating"] = rng.randint(2, 4)
+    if rng.random() < 0.5:
+        filters["amenities"] = rng.sample(AMENITIES, rng.randint(1, 2))
+    if rng.random() < 0.3:
+        filters["price_range"] = rng.sample(RANGES, 2)
+    if rng.random() < 0.3:
+        filters["max_price"] = rng.choice((1000, 2500, 5000))
+    return filters
+
+
+def loop_quotes(hotels, guests, sort_by="price", top_n=None, min_rating=None,
+                amenities=None, price_range=None, max_price=None):
+    """
+    Reference: price and filter each hotel in Python, then sort.
+    """
+    offers = []
+    for hotel in hotels:
+        if min_rating is not None and hotel["rating"] < min_rating:
+            continue
+        if amenities and not all(a in hotel["amenities"] for a in amenities):
+            continue
+        if price_range and hotel["price_range"] not in price_range:
+            continue
+        total = stay_price(base_price(hotel), NIGHTS, guests)
+        if max_price is not None and total > max_price:
+            continue
+        offers.append((hotel, total))
+
+    if sort_by == "price":
+        offers.sort(key=lambda offer: (offer[1], -offer[0]["rating"]))
+    else:
+        offers.sort(key=lambda offer: (-offer[0]["rating"], offer[1]))
+    return offers[:top_n]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--loops", type=int, default=5, help="Python-loop quotes per case (slow)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{NIGHTS} nights, top 20 offers, {args.queries} filtered quotes per case\n")
+    print(f"{'hotels':>8} {'build ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'loop ms':>9} {'speedup':>8}")
+
+    for size in args.sizes:
+        hotels = make_hotels(size, rng)
+        register_hotels(CITY, hotels)
+        _, build_ms = timed(lambda: (get_hotel_catalog(CITY), get_inventory(CITY)))
+
+        cases = [(rng.randint(1, 4), make_filters(rng)) for _ in range(args.queries)]
+        timings = [
+            timed(quote_hotels, CITY, CHECK_IN, CHECK_OUT, guests, **filters)[1]
+            for guests, filters in cases
+        ]
+
+        loop_timings = []
+        for guests, filters in cases[:args.loops]:
+            expected, ms = timed(loop_quotes, hotels, guests, **filters)
+            loop_timings.append(ms)
+            got = quote_hotels(CITY, CHECK_IN, CHECK_OUT, guests, **filters)
+            assert [o["total_price"] for o in got] == [round(t, 2) for _, t in expected], "quotes disagree with loop"
+            assert [o["hotel"]["rating"] for o in got] == [h["rating"] for h, _ in expected], "ranking disagrees"
+
+        p50 = statistics.median(timings)
+        p99 = sorted(timings)[min(len(timings) - 1, int(len(timings) * 0.99))]
+        loop = statistics.median(loop_timings)
+        print(f"{size:>8} {build_ms:>9.1f} {p50:>8.3f} {p99:>8.3f} {loop:>9.2f} {loop / p50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Load test: concurrent hotel bookings against one HotelInventory.
+
+Thread workers and asyncio tasks book random stays at the same small set of
+hotels, so most nights sell out and bookings race for the last rooms. Each
+booking is reserve -> commit, some are cancelled, and some holds are left to
+expire. Afterwards the per-night room counts are rebuilt from what the workers
+were told they got and compared with the hotels' capacity. Run from the
+project root:
+
+    python -m benchmarks.inventory [--threads 8] [--tasks 8] [--seconds 3]
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from tools.inventory import HotelInventory, SoldOutError
+
+
+HOTELS = 20
+ROOMS = 25  # per hotel, small enough that nights sell out
+WINDOW_DAYS = 60  # check-in dates are spread over this many days
+MAX_NIGHTS = 7
+START = date(2026, 1, 1)
+
+
+class Worker:
+    """
+    Books random stays and keeps its own ledger of what it holds.
+    """
+
+    def __init__(self, inventory, seed, cancel_rate, abandon_rate):
+        self.inventory = inventory
+        self.rng = random.Random(seed)
+        self.cancel_rate = cancel_rate
+        self.abandon_rate = abandon_rate
+        self.booked = {}  # booking_id -> (hotel, check_in, check_out, rooms)
+        self.ops = self.sold_out = self.abandoned = self.cancelled = 0
+
+    def step(self):
+        rng = self.rng
+        hotel = f"H{rng.randrange(HOTELS):03d}"
+        check_in = START + timedelta(days=rng.randrange(WINDOW_DAYS))
+        check_out = check_in + timedelta(days=rng.randint(1, MAX_NIGHTS))
+        rooms = rng.choice((1, 1, 1, 2))
+        self.ops += 1
+
+        try:
+            hold_id = self.inventory.reserve(hotel, check_in, check_out, rooms)
+        except SoldOutError:
+            self.sold_out += 1
+            return
+
+        if rng.random() < self.abandon_rate:
+            self.abandoned += 1  # never committed; expires after the hold TTL
+            return
+
+        self.inventory.commit(hold_id)
+        self.booked[hold_id] = (hotel, check_in, check_out, rooms)
+
+        if self.booked and rng.random() < self.cancel_rate:
+            booking_id = rng.choice(list(self.booked))
+            assert self.inventory.release(booking_id), "release of a live booking failed"
+            del self.booked[booking_id]
+            self.cancelled += 1
+
+
+def run_thread(worker, deadline):
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            worker.step()
+
+
+async def run_task(worker, deadline):
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            worker.step()
+        await asyncio.sleep(0)  # let the other tasks interleave
+
+
+def run_asyncio(workers, deadline):
+    async def main():
+        await asyncio.gather(*(run_task(worker, deadline) for worker in workers))
+    asyncio.run(main())
+
+
+def verify(inventory, workers):
+    """
+    Rebuild rooms booked per hotel and night from the workers' ledgers and
+    check them against capacity and the inventory's own arrays.
+    """
+    ledger = np.zeros((HOTELS, WINDOW_DAYS + MAX_NIGHTS), dtype=np.int64)
+    for worker in workers:
+        for hotel, check_in, check_out, rooms in worker.booked.values():
+            start = (check_in - START).days
+            ledger[int(hotel[1:]), start:start + (check_out - check_in).days] += rooms
+
+    # Holds left to expire still count until their TTL has passed
+    inventory.check()
+    booked = inventory.booked_rooms()[:, :ledger.shape[1]]
+    assert (ledger <= ROOMS).all(), "overbooked: a night has more bookings than rooms"
+    assert (ledger <= booked).all(), "a confirmed booking is missing from the inventory"
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=8, help="asyncio tasks on one extra thread")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--cancel-rate", type=float, default=0.2)
+    parser.add_argument("--abandon-rate", type=float, default=0.05)
+    parser.add_argument("--hold-ttl", type=float, default=0.5, help="seconds before abandoned holds expire")
+    args = parser.parse_args()
+
+    hotels = [{"id": f"H{i:03d}", "rooms": ROOMS} for i in range(HOTELS)]
+    inventory = HotelInventory(hotels, start=START, hold_ttl=args.hold_ttl)
+
+    thread_workers = [Worker(inventory, i, args.cancel_rate, args.abandon_rate) for i in range(args.threads)]
+    task_workers = [
+        Worker(inventory, 1000 + i, args.cancel_rate, args.abandon_rate) for i in range(args.tasks)
+    ]
+    workers = thread_workers + task_workers
+
+    print(f"{HOTELS} hotels x {ROOMS} rooms, {WINDOW_DAYS} check-in days, "
+          f"{args.threads} threads + {args.tasks} asyncio tasks for {args.seconds:.0f}s\n")
+
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    threads = [threading.Thread(target=run_thread, args=(w, deadline)) for w in thread_workers]
+    threads.append(threading.Thread(target=run_asyncio, args=(task_workers, deadline)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ops = sum(w.ops for w in workers)
+    sold_out = sum(w.sold_out for w in workers)
+    abandoned = sum(w.abandoned for w in workers)
+    cancelled = sum(w.cancelled for w in workers)
+    confirmed = sum(len(w.booked) for w in workers)
+
+    ledger = verify(inventory, workers)
+
+    # Let abandoned holds expire, then only confirmed bookings may remain
+    time.sleep(args.hold_ttl)
+    inventory.rooms_left("H000", START, START + timedelta(days=1))  # triggers expiry
+    inventory.check()
+    assert (inventory.booked_rooms()[:, :ledger.shape[1]] == ledger).all(), "expired holds kept their rooms"
+
+    full = int((ledger == ROOMS).sum())
+    print(f"{'booking attempts':<22} {ops:>10}  ({ops / elapsed:,.0f}/s)")
+    print(f"{'sold out':<22} {sold_out:>10}")
+    print(f"{'abandoned holds':<22} {abandoned:>10}")
+    print(f"{'cancelled':<22} {cancelled:>10}")
+    print(f"{'confirmed at end':<22} {confirmed:>10}")
+    print(f"{'sold-out hotel nights':<22} {full:>10}  of {ledger.size}")
+    print(f"{'max rooms on a night':<22} {int(ledger.max()):>10}  (capacity {ROOMS})")
+    print("\nNo overbooking: every night's bookings fit its rooms, and the inventory matches the ledger.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Latency benchmark: route solvers and the day-by-day itinerary planner.
+
+Part 1 times the route solvers on random stops around Kyoto. Held-Karp
+(exact) is compared with nearest neighbour + 2-opt on small sets, and for
+large sets 2-opt is compared with the nearest-neighbour tour it starts from.
+Part 2 times plan_itinerary on 200+ candidate attractions with crowd
+forecasts, for short and long trips, plus a single-day tour through all of
+them (no hour limit). Held-Karp is checked against brute force on tiny sets.
+Run from the project root:
+
+    python -m benchmarks.itinerary [--candidates 200 500] [--repeats 5]
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from benchmarks.spatial import make_catalog
+from tools.attractions import CITY_CENTERS
+from tools.crowds import CrowdForecast
+from tools.itinerary import plan_itinerary
+from tools.routing import distance_matrix, held_karp, nearest_neighbor, route_length, two_opt
+
+
+START = date(2026, 11, 1)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def random_matrix(n, rng):
+    lat0, lon0 = CITY_CENTERS["kyoto"]
+    lats = lat0 + rng.uniform(-0.08, 0.08, n + 1)
+    lons = lon0 + rng.uniform(-0.1, 0.1, n + 1)
+    return distance_matrix(lats, lons)
+
+
+def check_exact(rng):
+    for n in range(1, 8):
+        dist = random_matrix(n, rng)
+        best = min(itertools.permutations(range(1, n + 1)), key=lambda route: route_length(dist, route))
+        assert abs(route_length(dist, held_karp(dist)) - route_length(dist, best)) < 1e-9, "Held-Karp not optimal"
+
+
+def solver_table(rng, repeats):
+    print(f"{'stops':>6} {'exact ms':>9} {'2-opt ms':>9} {'2-opt gap':>10}")
+    for n in (8, 10, 12):
+        rows = []
+        for _ in range(repeats):
+            dist = random_matrix(n, rng)
+            exact, exact_ms = timed(held_karp, dist)
+            heuristic, heuristic_ms = timed(lambda: two_opt(dist, nearest_neighbor(dist)))
+            gap = route_length(dist, heuristic) / route_length(dist, exact) - 1
+            rows.append((exact_ms, heuristic_ms, gap))
+        exact_ms, heuristic_ms, gap = (statistics.median(column) for column in zip(*rows))
+        print(f"{n:>6} {exact_ms:>9.2f} {heuristic_ms:>9.2f} {gap:>9.1%}")
+
+    print(f"\n{'stops':>6} {'NN ms':>9} {'2-opt ms':>9} {'vs NN':>10}")
+    for n in (50, 200, 500):
+        rows = []
+        for _ in range(repeats):
+            dist = random_matrix(n, rng)
+            start, nn_ms = timed(nearest_neighbor, dist)
+            improved, opt_ms = timed(two_opt, dist, start)
+            rows.append((nn_ms, opt_ms, route_length(dist, improved) / route_length(dist, start) - 1))
+        nn_ms, opt_ms, change = (statistics.median(column) for column in zip(*rows))
+        print(f"{n:>6} {nn_ms:>9.2f} {opt_ms:>9.2f} {change:>9.1%}")
+
+
+def planner_table(candidates, repeats):
+    rng = random.Random(7)
+    hotel = CITY_CENTERS["kyoto"]
+    print(f"\n{'POIs':>6} {'days':>5} {'p50 ms':>8} {'max ms':>8} {'scheduled':>10} {'km/day':>7}")
+    for count in candidates:
+        cases = [(3, None), (7, None), (14, None), (1, 10_000.0)]
+        for days, day_hours in cases:
+            timings, result = [], None
+            for _ in range(repeats):
+                pois = make_catalog(count, hotel, rng)
+                for poi in pois:
+                    poi["crowd_forecast"] = CrowdForecast(START, days, seed=rng.getrandbits(32))
+                kwargs = {"day_hours": day_hours} if day_hours else {}
+                result, ms = timed(plan_itinerary, pois, START, START + timedelta(days=days - 1), hotel, **kwargs)
+                timings.append(ms)
+            scheduled = sum(len(day["stops"]) for day in result["days"])
+            km = np.mean([day["travel_km"] for day in result["days"]])
+            label = f"{days}" if day_hours is None else "1*"
+            print(f"{count:>6} {label:>5} {statistics.median(timings):>8.1f} {max(timings):>8.1f} "
+                  f"{scheduled:>10} {km:>7.1f}")
+    print("\n* one day with no hour limit: a single route through every candidate")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[200, 500])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    check_exact(rng)
+    solver_table(rng, args.repeats)
+    planner_table(args.candidates, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
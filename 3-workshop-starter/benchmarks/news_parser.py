@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: BeautifulSoup feed parse vs streaming lxml parse.
+
+Runs both parsers on the saved feed fixture and reports time per parse and
+peak memory. First checks that both parsers agree on it and on a malformed
+feed, which must still yield every item. Run from the project root:
+
+    python -m benchmarks.news_parser [--limit 10] [--repeat 50]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from tools.singapore_news import parse_feed, parse_feed_stream
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "mothership_feed.xml"
+MALFORMED_FIXTURE = Path(__file__).parent / "fixtures" / "mothership_feed_malformed.xml"
+MALFORMED_ITEMS = 2
+CHUNK_SIZE = 4096  # Roughly what httpx.iter_bytes() hands over per read
+
+
+def soup_parse(raw, limit):
+    return parse_feed(raw.decode("utf-8"), limit)
+
+
+def stream_parse(raw, limit):
+    chunks = (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    return parse_feed_stream(chunks, limit)
+
+
+def measure(fn, raw, limit, repeat):
+    """
+    Returns: (median ms per parse, peak KiB allocated during one parse)
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(raw, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn(raw, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = FIXTURE.read_bytes()
+
+    soup_items = soup_parse(raw, args.limit)
+    stream_items = stream_parse(raw, args.limit)
+    assert soup_items == stream_items, "parsers disagree on the fixture"
+
+    malformed = MALFORMED_FIXTURE.read_bytes()
+    soup_items = soup_parse(malformed, args.limit)
+    stream_items = stream_parse(malformed, args.limit)
+    assert len(soup_items) == MALFORMED_ITEMS, "soup parser lost items in the malformed feed"
+    assert soup_items == stream_items, "parsers disagree on the malformed feed"
+
+    print(f"Fixture: {FIXTURE.name} ({len(raw) / 1024:.0f} KiB), limit={args.limit}, repeat={args.repeat}\n")
+    print(f"{'parser':<8} {'median ms':>10} {'peak KiB':>10}")
+
+    results = {}
+    for name, fn in (("soup", soup_parse), ("stream", stream_parse)):
+        results[name] = measure(fn, raw, args.limit, args.repeat)
+        ms, kib = results[name]
+        print(f"{name:<8} {ms:>10.2f} {kib:>10.0f}")
+
+    speedup = results["soup"][0] / results["stream"][0]
+    print(f"\nstream is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
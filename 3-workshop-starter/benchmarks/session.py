@@ -0,0 +1,201 @@
+"""
+End-to-end benchmark: full travel-planning sessions from request to summary.
+
+Drives main.run_session() headlessly for scripted requests, with the LLM and
+the attraction/weather/hotel tools replaced by stubs that sleep for a fixed
+latency. Reports p50/p95 session latency, coordinator/agent turns and LLM
+calls per session, and sessions/second at the given concurrency. Results are
+written as JSON so runs on different commits can be compared. Run from the
+project root:
+
+    python -m benchmarks.session [--sessions 20] [--concurrency 4]
+        [--llm-latency 0.05] [--tool-latency 0.01]
+        [--output benchmarks/results/session.json] [--compare old.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from langchain.schema import AIMessage
+
+import agents.llm
+import nodes
+from main import run_session
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "session_requests.jsonl"
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "session.json"
+LEAD_DAYS = 30  # the earliest fixture stay is moved this far ahead of today
+
+
+class StubLLM:
+    """
+    Stands in for ChatOpenAI: sleeps, counts the call and returns a short Message.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        return AIMessage(
+            content="Thought: the task is clear.\nMessage: On it.",
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": 12, "total_tokens": prompt_tokens + 12}
+        )
+
+
+def with_latency(fn, latency):
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def install_stubs(llm_latency, tool_latency):
+    """
+    Route every backend the session touches to local stubs.
+
+    Returns: The StubLLM, for its call count
+    """
+    llm = StubLLM(llm_latency)
+    agents.llm.get_llm = lambda model, temperature=1: llm
+    # Measure the agent loop, not the response cache or a recorded trace
+    agents.llm.get_llm_cache = lambda: None
+    agents.llm.get_session_trace = lambda: None
+
+    nodes.search_attractions = with_latency(nodes.search_attractions, tool_latency)
+    nodes.get_weather = with_latency(nodes.get_weather, tool_latency)
+    nodes.quote_hotels = with_latency(nodes.quote_hotels, tool_latency)
+    nodes.book_hotel = with_latency(nodes.book_hotel, tool_latency)
+    return llm
+
+
+def load_requests(path):
+    """
+    Returns: The fixture's requests, with all dates shifted by one offset so the
+        earliest check-in is LEAD_DAYS from today (the inventory rejects past stays)
+    """
+    with open(path, encoding="utf-8") as f:
+        requests = [json.loads(line) for line in f if line.strip()]
+    first = min(date.fromisoformat(request["check_in"]) for request in requests)
+    shift = date.today() + timedelta(days=LEAD_DAYS) - first
+    for request in requests:
+        for key in ("check_in", "check_out"):
+            request[key] = (date.fromisoformat(request[key]) + shift).isoformat()
+    return requests
+
+
+def run_one(request):
+    """
+    Returns: (seconds, turn_stats, completed, LLM usage totals)
+    """
+    state = nodes.initial_state(request)
+    start = time.perf_counter()
+    run_session(state, on_board_entry=lambda entry: None)
+    elapsed = time.perf_counter() - start
+    completed = not state.get("error") and bool(state["shared_state"]["bookings"])
+    return elapsed, state["turn_stats"], completed, state["metrics"]["totals"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(requests, sessions, concurrency, llm_latency, tool_latency):
+    llm = install_stubs(llm_latency, tool_latency)
+    scripted = [requests[i % len(requests)] for i in range(sessions)]
+
+    # Sessions print their progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(run_one, scripted))
+        wall = time.perf_counter() - start
+
+    latencies = [seconds for seconds, _, _, _ in outcomes]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "params": {
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "llm_latency": llm_latency,
+            "tool_latency": tool_latency
+        },
+        "results": {
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "mean_ms": statistics.mean(latencies) * 1000,
+            "sessions_per_sec": sessions / wall,
+            "coordinator_turns_per_session": statistics.mean(t["coordinator"] for _, t, _, _ in outcomes),
+            "agent_turns_per_session": statistics.mean(t["agents"] for _, t, _, _ in outcomes),
+            "llm_calls_per_session": llm.calls / sessions,
+            "prompt_tokens_per_session": statistics.mean(u["prompt_tokens"] for _, _, _, u in outcomes),
+            "completed": sum(done for _, _, done, _ in outcomes)
+        }
+    }
+
+
+def print_report(report, baseline=None):
+    params, results = report["params"], report["results"]
+    print(f"Sessions: {params['sessions']}, concurrency: {params['concurrency']}, "
+          f"LLM latency: {params['llm_latency'] * 1000:.0f} ms, tool latency: {params['tool_latency'] * 1000:.0f} ms\n")
+
+    for key, value in results.items():
+        line = f"{key:<32} {value:>10.2f}"
+        if baseline and key in baseline["results"] and baseline["results"][key]:
+            change = (value - baseline["results"][key]) / baseline["results"][key] * 100
+            line += f"   {change:+.1f}% vs {baseline.get('commit') or 'baseline'}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=Path, default=FIXTURE, help="JSONL of TravelRequest records")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per stubbed LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.01, help="seconds per stubbed tool call")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        load_requests(args.requests), args.sessions, args.concurrency, args.llm_latency, args.tool_latency
+    )
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Scaling benchmark: grid-indexed attraction search vs a full scan.
+
+Builds synthetic POI catalogs of increasing size around Kyoto and reports
+index build time and radius-query latency (p50/p99) next to a brute-force
+Python scan. Every indexed answer is checked against the scan. Run from the
+project root:
+
+    python -m benchmarks.spatial [--sizes 1000 10000 100000] [--radius 1 5] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from tools.attractions import CITY_CENTERS
+from tools.spatial import PoiIndex, brute_force_query, suggest_cell_km
+
+
+SPREAD_KM = 12  # catalog covers +-12 km around the city center
+TOP_N = 10
+
+
+def make_catalog(size, center, rng):
+    lat0, lon0 = center
+    return [
+        {
+            "name": f"POI {i}",
+            "type": "synthetic",
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "lat": lat0 + rng.uniform(-SPREAD_KM, SPREAD_KM) / 111.32,
+            "lon": lon0 + rng.uniform(-SPREAD_KM, SPREAD_KM) / 91.0,
+            "description": "",
+            "visit_duration": 1
+        }
+        for i in range(size)
+    ]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000])
+    parser.add_argument("--radius", type=float, nargs="+", default=[1.0, 5.0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scans", type=int, default=5, help="brute-force queries per case (slow)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    center = CITY_CENTERS["kyoto"]
+
+    print(f"top_n={TOP_N}, {args.queries} queries per case\n")
+    print(f"{'POIs':>8} {'build ms':>9} {'radius km':>10} {'p50 ms':>8} {'p99 ms':>8} {'scan ms':>9} {'speedup':>8}")
+
+    for size in args.sizes:
+        pois = make_catalog(size, center, rng)
+        index, build_ms = timed(lambda: PoiIndex(pois, cell_km=suggest_cell_km(pois)))
+
+        for radius in args.radius:
+            points = [
+                (center[0] + rng.uniform(-8, 8) / 111.32, center[1] + rng.uniform(-8, 8) / 91.0)
+                for _ in range(args.queries)
+            ]
+            timings = [timed(index.query, lat, lon, radius, TOP_N)[1] for lat, lon in points]
+
+            scan_timings = []
+            for lat, lon in points[:args.scans]:
+                expected, ms = timed(brute_force_query, pois, lat, lon, radius, TOP_N)
+                scan_timings.append(ms)
+                got = index.query(lat, lon, radius, TOP_N)
+                assert [p["name"] for p in got] == [p["name"] for p in expected], "index disagrees with scan"
+
+            p50 = statistics.median(timings)
+            p99 = sorted(timings)[min(len(timings) - 1, int(len(timings) * 0.99))]
+            scan = statistics.median(scan_timings)
+            print(f"{size:>8} {build_ms:>9.1f} {radius:>10.1f} {p50:>8.3f} {p99:>8.3f} {scan:>9.1f} {scan / p50:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Scaling benchmark: vectorized, cached weather forecasts vs a per-day loop.
+
+Times forecasts for growing numbers of points and trip lengths three ways:
+the per-day Python loop get_weather used to run (random.uniform and season
+branches for every day), the vectorized generator on a cold cache, and an
+overlapping trip (shifted by a third of its length) on the warm cache. Also
+checks that a seeded generator gives the same forecast however the days were
+cached.
+Run from the project root:
+
+    python -m benchmarks.weather [--points 1 100 10000] [--days 7 30 365]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from tools.weather import WEATHER_CODES, WeatherGenerator
+
+
+START = date(2026, 3, 1)
+SPREAD_DEG = 5.0  # points spread around Kyoto
+
+
+def loop_forecast(points, start, days):
+    """
+    Reference: the per-day loop get_weather ran before vectorizing.
+    """
+    out = []
+    for lat, lon in points:
+        daily = []
+        for i in range(days):
+            day = start + timedelta(days=i)
+            if day.month in [6, 7, 8]:
+                high, low, precip = random.uniform(28, 35), random.uniform(20, 25), random.uniform(0.3, 0.7)
+            elif day.month in [12, 1, 2]:
+                high, low, precip = random.uniform(8, 15), random.uniform(1, 7), random.uniform(0.2, 0.4)
+            else:
+                high, low, precip = random.uniform(18, 25), random.uniform(10, 17), random.uniform(0.1, 0.3)
+            daily.append({
+                "date": day.strftime("%Y-%m-%d"),
+                "temperature_max": round(high, 1),
+                "temperature_min": round(low, 1),
+                "precipitation_probability": round(precip, 2),
+                "weather_code": random.choice(WEATHER_CODES)
+            })
+        out.append(daily)
+    return out
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 30, 365])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    # Same seed, different cache history -> same forecast
+    a, b = WeatherGenerator(seed=args.seed), WeatherGenerator(seed=args.seed)
+    b.forecast([35.0], [135.77], START + timedelta(days=3), START + timedelta(days=20))
+    assert np.array_equal(
+        a.forecast([35.0], [135.77], START, START + timedelta(days=9)),
+        b.forecast([35.0], [135.77], START, START + timedelta(days=9))
+    ), "seeded forecasts depend on what was cached"
+
+    print(f"{'points':>7} {'days':>5} {'loop ms':>9} {'cold ms':>9} {'warm ms':>9} {'speedup':>8}  warm cache")
+    for count in args.points:
+        lats = 35.0 + rng.uniform(-SPREAD_DEG, SPREAD_DEG, count)
+        lons = 135.77 + rng.uniform(-SPREAD_DEG, SPREAD_DEG, count)
+        points = list(zip(lats.tolist(), lons.tolist()))
+
+        for days in args.days:
+            end = START + timedelta(days=days - 1)
+            _, loop_ms = timed(loop_forecast, points, START, days)
+
+            generator = WeatherGenerator(seed=args.seed)
+            _, cold_ms = timed(generator.forecast, lats, lons, START, end)
+
+            # An overlapping trip, shifted by a third of its length, reuses the rest
+            shift = timedelta(days=max(1, days // 3))
+            before = generator.stats()
+            _, warm_ms = timed(generator.forecast, lats, lons, START + shift, end + shift)
+            after = generator.stats()
+            reused = after["days_cached"] - before["days_cached"]
+
+            print(f"{count:>7} {days:>5} {loop_ms:>9.2f} {cold_ms:>9.2f} {warm_ms:>9.2f} "
+                  f"{loop_ms / cold_ms:>7.1f}x  {reused} of {reused + after['days_generated'] - before['days_generated']} days reused")
+
+
+if __name__ == "__main__":
+    main()
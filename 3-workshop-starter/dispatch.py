@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import copy
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from state import State
+from nodes import planner_node, researcher_node, booker_node
+
+
+# Run every agent that owns an independent pending task in the same loop turn.
+# Set CONCURRENT_DISPATCH=false to fall back to one agent per turn.
+CONCURRENT_DISPATCH = os.getenv("CONCURRENT_DISPATCH", "true").lower() == "true"
+
+AGENT_NODES = {
+    "planner": planner_node,
+    "researcher": researcher_node,
+    "booker": booker_node
+}
+
+# Agents whose tasks do not depend on each other and can safely run side by side
+WORKER_AGENTS = ("researcher", "booker")
+
+# Threads for blocking node calls (LLM round trips, tools), shared by every
+# session in the process. Sessions themselves run on the event loop.
+NODE_WORKERS = int(os.getenv("NODE_WORKERS", "32"))
+
+_node_executor = None
+_node_executor_lock = threading.Lock()
+
+
+def pending_agents(state: State) -> List[str]:
+    """
+    Agents that own at least one pending task, in task order.
+
+    Args:
+        state: Current system state
+
+    Returns:
+        Distinct agent IDs, e.g. ["researcher", "booker"]
+    """
+    shared = state.get("shared_state") or {}
+    task_status = shared.get("task_status", {})
+
+    agents = []
+    for task in shared.get("tasks", []):
+        status = task_status.get(task["id"], {}).get("status")
+        agent = task.get("assigned_to")
+        if status == "pending" and agent and agent not in agents:
+            agents.append(agent)
+    return agents
+
+
+def run_concurrently(fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    """
+    Call fn on every item in a thread pool and return results in item order.
+    A single item runs inline without a pool. Each worker runs in a copy of
+    the caller's context, so tracing spans keep their parent.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def node_executor() -> ThreadPoolExecutor:
+    """
+    Returns: The process-wide pool for blocking node calls (created on first use)
+    """
+    global _node_executor
+    with _node_executor_lock:
+        if _node_executor is None:
+            _node_executor = ThreadPoolExecutor(max_workers=NODE_WORKERS, thread_name_prefix="node")
+        return _node_executor
+
+
+async def offload(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Await a blocking call on the node pool. The call runs in a copy of the
+    caller's context, so session metrics, RNGs and tracing spans follow it.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(node_executor(), contextvars.copy_context().run, fn, *args)
+
+
+async def run_agents_concurrently(state: State, agents: List[str]) -> Dict[str, Any]:
+    """
+    Run several agent nodes at the same time and merge their updates.
+
+    Each node works on a private snapshot of `shared_state` and `message_board`
+    so nodes never mutate the same dict or list from two threads. Once all of
+    them finish, their changes are merged back into `state` in one place.
+
+    Args:
+        state: Current system state (updated in place)
+        agents: Agent IDs to run, e.g. ["researcher", "booker"]
+
+    Returns:
+        Dict with merged updates, same shape as a single node's return value
+    """
+    base_len = len(state.get("message_board", []))
+
+    async def run(agent):
+        snapshot = dict(state)
+        snapshot["shared_state"] = copy.deepcopy(state["shared_state"])
+        snapshot["message_board"] = list(state.get("message_board", []))
+        updates = await offload(AGENT_NODES[agent], snapshot) or {}
+        return agent, snapshot, updates
+
+    outcomes = await asyncio.gather(*(run(agent) for agent in agents))
+    return merge_agent_outcomes(state, outcomes, base_len)
+
+
+def merge_agent_outcomes(
+    state: State,
+    outcomes: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+    base_len: int
+) -> Dict[str, Any]:
+    """
+    Fold the snapshots produced by run_agents_concurrently back into state.
+
+    - message_board: new entries from every agent, ordered by timestamp
+    - task_status: statuses each agent changed (agents only touch their own tasks)
+    - results: keys each agent added or changed
+    - bookings: bookings each agent appended
+    - error: first error reported by any agent
+    """
+    shared = state["shared_state"]
+    board = state.setdefault("message_board", [])
+    original_status = copy.deepcopy(shared["task_status"])
+    original_results = dict(shared["results"])
+    original_bookings = len(shared["bookings"])
+
+    new_entries = []
+    error = state.get("error")
+
+    for agent, snapshot, updates in outcomes:
+        if not updates:
+            continue
+
+        new_entries.extend(snapshot["message_board"][base_len:])
+
+        snap_shared = snapshot["shared_state"]
+        for task_id, status in snap_shared["task_status"].items():
+            if status != original_status.get(task_id):
+                shared["task_status"][task_id] = status
+
+        for key, value in snap_shared["results"].items():
+            if key not in original_results or value != original_results[key]:
+                shared["results"][key] = value
+
+        shared["bookings"].extend(snap_shared["bookings"][original_bookings:])
+
+        if updates.get("error") and not error:
+            error = updates["error"]
+
+    # Stable sort keeps each agent's own entries in the order it posted them
+    new_entries.sort(key=lambda entry: entry["timestamp"])
+    board.extend(new_entries)
+    state["error"] = error
+
+    return {
+        "shared_state": shared,
+        "message_board": board,
+        "error": error
+    }
@@ -1,8 +1,16 @@
 from dotenv import load_dotenv
-from langgraph.graph import StateGraph, START, END
 
-from state import State
-from nodes import (
+# Load .env before the project imports: their settings are read at import time
+load_dotenv(override=True)  # Override, so it would use your local .env file
+
+import asyncio  # noqa: E402
+import threading  # noqa: E402
+
+from langchain_core.runnables import RunnableConfig  # noqa: E402
+from langgraph.graph import StateGraph, START, END  # noqa: E402
+
+from state import State  # noqa: E402
+from nodes import (  # noqa: E402
     human_input_node,
     check_completion,
     planner_node,
@@ -10,58 +18,230 @@ from nodes import (
     booker_node,
     summarizer_node
 )
-from agents.coordinator import travel_coordinator
+from agents.coordinator import travel_coordinator  # noqa: E402
+from agents.llm import LLM_WARMUP, warm_up  # noqa: E402
+from agents.streaming import LLM_STREAM, TerminalPrinter, token_sink  # noqa: E402
+from dispatch import AGENT_NODES, CONCURRENT_DISPATCH, offload, run_agents_concurrently  # noqa: E402
+from metrics import new_metrics, session_metrics  # noqa: E402
+from record_replay import session_random_streams  # noqa: E402
+from tracing import span  # noqa: E402
 
 
-load_dotenv(override=True)  # Override, so it would use your local .env file
+# Keys an agent node may change; anything else it returns is ignored
+AGENT_UPDATE_KEYS = ("message_board", "shared_state", "phase", "next_agent", "error")
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+class SessionFeed:
+    """
+    Per-session hooks for the shared graph, passed in config["configurable"].
+
+    After every node the caller's state dict is brought up to date and new
+    message_board entries are handed to on_board_entry.
+    """
+
+    def __init__(self, state, on_board_entry):
+        self.state = state
+        self.on_board_entry = on_board_entry
+        self.shown = 0
+
+    def publish(self, state):
+        self.state.update(state)
+        board = self.state.get("message_board", [])
+        for entry in board[self.shown:]:
+            self.on_board_entry(entry)
+        self.shown = len(board)
+        return state
+
+
+def _feed(config: RunnableConfig) -> SessionFeed:
+    return config["configurable"]["session"]
+
+
+async def human_step(state: State, config: RunnableConfig):
+    return _feed(config).publish(await offload(human_input_node, None))
+
+
+async def coordinator_step(state: State, config: RunnableConfig):
+    state = dict(state)
+    feed = _feed(config)
+    while True:
+        # Coordinator is the central router: it picks the next agent(s) and posts its thinking trace
+        state.update(await offload(travel_coordinator, state))
+        state["turn_stats"]["coordinator"] += 1
+        if _dispatch_target(state) != "coordinator":
+            return feed.publish(state)
+
+        # coordinator may be scheduled as next_agent by planner/researcher/booker;
+        # it takes that turn itself to process returned parts/results
+        state["volley_msg_left"] = state.get("volley_msg_left", 0) - 1
+        feed.publish(state)
+        if _next_turn(state) == "summarize":
+            return state
+
+
+def agent_step(agent):
+    """
+    Returns: Graph node running one agent and merging its updates
+    """
+    async def step(state: State, config: RunnableConfig):
+        state = dict(state)
+        updates = await offload(AGENT_NODES[agent], state) or {}
+        state.update({key: updates[key] for key in AGENT_UPDATE_KEYS if key in updates})
+        state["turn_stats"]["agents"] += 1
+        state["volley_msg_left"] = state.get("volley_msg_left", 0) - 1
+        return _feed(config).publish(state)
+
+    return step
+
+
+async def dispatch_step(state: State, config: RunnableConfig):
+    # Independent worker tasks run side by side so the turn takes as long as the slowest agent
+    state = dict(state)
+    agents = state["next_agents"]
+    state.update(await run_agents_concurrently(state, agents))
+    state["turn_stats"]["agents"] += len(agents)
+    state["volley_msg_left"] = state.get("volley_msg_left", 0) - 1
+    return _feed(config).publish(state)
+
+
+async def summarize_step(state: State, config: RunnableConfig):
+    state = dict(state)
+    if check_completion(state) != "summarize":
+        print("\nVolley exhausted — generating summary...\n")
+    await offload(summarizer_node, state)
+    return _feed(config).publish(state)
+
+
+def _route_start(state: State) -> str:
+    return _next_turn(state) if state.get("request") else "human"
+
+
+def _next_turn(state: State) -> str:
+    """
+    Summarize once the trip is complete or the volley is exhausted,
+    otherwise hand back to the coordinator.
+    """
+    if check_completion(state) == "summarize" or state.get("volley_msg_left", 0) <= 0:
+        return "summarize"
+    return "coordinator"
+
+
+def _dispatch_target(state: State) -> str:
+    next_agents = state.get("next_agents") or []
+    if CONCURRENT_DISPATCH and len(next_agents) > 1:
+        return "dispatch"
+    return state.get("next_agent") or state.get("next_speaker")
+
+
+def _route_coordinator(state: State) -> str:
+    target = _dispatch_target(state)
+    if target == "dispatch" or target in AGENT_NODES:
+        return target
+    if target == "coordinator":
+        # coordinator_step only hands back its own turn once the session is over
+        return "summarize"
+    print(f"Unknown agent: {target}" if target else "No agent selected. Stopping.")
+    return END
 
 
 def build_graph():
     """
     Build the LangGraph workflow.
 
-    Updated flow:
-      START -> human -> coordinator -> planner -> coordinator -> (researcher/booker) -> coordinator -> planner -> summarize -> END
+    Flow:
+      START -> (human) -> coordinator -> planner | researcher | booker | dispatch
+            -> coordinator ... -> summarize -> END
+
+    dispatch runs the researcher and booker side by side. Nodes are coroutines
+    that offload their blocking work to the shared node pool (dispatch.offload),
+    so many sessions can run the same compiled graph on one event loop.
     """
     builder = StateGraph(State)
 
-    # Add nodes
-    builder.add_node("human", human_input_node)
-    builder.add_node("coordinator", travel_coordinator)
-    builder.add_node("planner", planner_node)
-    builder.add_node("researcher", researcher_node)
-    builder.add_node("booker", booker_node)
-    builder.add_node("summarize", summarizer_node)
-
-    # Connect START to human (optional) and set the entry to the human node so the rendered graph
-    # shows all reachable nodes without treating START as an end node.
-    builder.add_edge(START, "human")
-    builder.set_entry_point("human")  # <-- use the human node name here, not START
-
-    # human -> coordinator
-    builder.add_edge("human", "coordinator")
-
-    # Coordinator orchestrates flow:
-    # coordinator -> planner
-    builder.add_edge("coordinator", "planner")
-    # planner -> coordinator (planner returns the parts/tasks to be done)
-    builder.add_edge("planner", "coordinator")
-
-    # coordinator -> researcher/booker (assign respective parts)
-    builder.add_edge("coordinator", "researcher")
-    builder.add_edge("coordinator", "booker")
-
-    # researcher/booker -> coordinator (return results/findings)
-    builder.add_edge("researcher", "coordinator")
-    builder.add_edge("booker", "coordinator")
-
-    # Coordinator may loop back to planner to assemble plan, then summarize -> END
-    builder.add_edge("coordinator", "summarize")
+    builder.add_node("human", human_step)
+    builder.add_node("coordinator", coordinator_step)
+    for agent in AGENT_NODES:
+        builder.add_node(agent, agent_step(agent))
+    builder.add_node("dispatch", dispatch_step)
+    builder.add_node("summarize", summarize_step)
+
+    # Headless sessions start with a request and skip the console prompt
+    builder.add_conditional_edges(START, _route_start, ["human", "coordinator", "summarize"])
+    builder.add_conditional_edges("human", _next_turn, ["coordinator", "summarize"])
+    builder.add_conditional_edges(
+        "coordinator", _route_coordinator,
+        [*AGENT_NODES, "dispatch", "summarize", END]
+    )
+    for agent in (*AGENT_NODES, "dispatch"):
+        builder.add_conditional_edges(agent, _next_turn, ["coordinator", "summarize"])
     builder.add_edge("summarize", END)
 
     return builder.compile()
 
 
+def session_graph():
+    """
+    Returns: The compiled workflow, built once per process and shared by every session
+    """
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            _graph = build_graph()
+        return _graph
+
+
+def print_board_entry(entry):
+    # Print only agent and content — timestamps are stored but not shown
+    print(f"{entry.get('agent')}: {entry.get('content')}")
+
+
+async def arun_session(state, on_board_entry=print_board_entry):
+    """
+    Run the automated coordinator/agent loop until the trip is summarized.
+
+    Headless: needs no console input, so scripts, benchmarks and the HTTP
+    service can drive whole sessions from initial_state(request). The session
+    runs on the caller's event loop; only blocking node calls take a thread.
+
+    Args:
+        state: Initial state from human_input_node / nodes.initial_state (updated in place)
+        on_board_entry: Called with each new message_board entry as it appears
+
+    Returns:
+        The final state. state["turn_stats"] counts coordinator and agent turns,
+        state["metrics"] holds LLM tokens, latency and cost per agent.
+    """
+    turn_stats = state.setdefault("turn_stats", {"coordinator": 0, "agents": 0})
+    metrics = state.setdefault("metrics", new_metrics())
+    feed = SessionFeed(state, on_board_entry)
+
+    # Each volley is at most a coordinator step plus an agent step
+    config = {
+        "configurable": {"session": feed},
+        "recursion_limit": 2 * max(0, state.get("volley_msg_left", 0)) + 10
+    }
+
+    # Root span of the session trace (TRACE=true); nodes, tools and LLM calls nest under it
+    request = state.get("request") or {}
+    with session_metrics(metrics), session_random_streams(), \
+            span("session", destination=request.get("destination", ""), guests=request.get("guests", 0)) as session_span:
+        feed.publish({})
+        await session_graph().ainvoke(state, config)
+        session_span.set(**turn_stats, cost_usd=metrics["totals"]["cost_usd"])
+
+    return state
+
+
+def run_session(state, on_board_entry=print_board_entry):
+    """
+    Blocking arun_session for scripts and worker threads (no event loop running).
+    """
+    return asyncio.run(arun_session(state, on_board_entry))
+
+
 def main():
     print("===TRAVEL PLANNER ===")
     print("Let me help plan your perfect trip to anywhere!")
@@ -70,12 +250,16 @@ def main():
     print("1. Get your travel preferences")
     print("2. Coordinator asks planner to break down tasks")
     print("3. Planner returns parts to coordinator")
-    print("4. Coordinator assigns parts to researcher/booker")
+    print("4. Coordinator assigns parts to researcher/booker (run side by side)")
     print("5. Researcher/Booker return findings to coordinator")
     print("6. Coordinator asks planner to assemble final plan and summarize\n")
     print("Initializing travel planning system...")
 
-    graph = build_graph()
+    # Open LLM connections in the background while the user types their request
+    if LLM_WARMUP:
+        warm_up()
+
+    graph = session_graph()
     print("\nWorkflow Graph:")
     print(graph.get_graph().draw_ascii())
     print("\nStarting interactive planning process...\n")
@@ -83,89 +267,13 @@ def main():
     # Initialize state using the human input node (collects destination/dates)
     state = human_input_node(None)
 
-    # Keep track of how many message_board entries we've displayed to the user
-    last_board_index = 0
-
     try:
-        # Automated loop: run until completion or volley exhausted
-        while True:
-            # Print any new message board entries for user visibility
-            board = state.get("message_board", [])
-            if len(board) > last_board_index:
-                for entry in board[last_board_index:]:
-                    # Print only agent and content — timestamps are stored but not shown
-                    agent = entry.get("agent")
-                    content = entry.get("content")
-                    print(f"{agent}: {content}")
-                last_board_index = len(board)
-
-            # Check if system should finalize
-            route = check_completion(state)
-            if route == "summarize":
-                summarizer_node(state)
-                break
-
-            # If volley_msg_left exhausted, finalize
-            volley_left = state.get("volley_msg_left", 0)
-            if volley_left <= 0:
-                print("\nVolley exhausted — generating summary...\n")
-                summarizer_node(state)
-                break
-
-            # Run coordinator to select next agent and post its thinking trace.
-            # Coordinator is the central router in the updated flow.
-            updates = travel_coordinator(state)
-            # Merge updates into state
-            for k, v in updates.items():
-                if k == "message_board":
-                    state.setdefault("message_board", [])
-                    state["message_board"] = v
-                else:
-                    state[k] = v
-
-            # Determine which agent to run next
-            next_agent = state.get("next_agent") or state.get("next_speaker")
-            if not next_agent:
-                print("No agent selected. Stopping.")
-                break
-
-            # Call the appropriate agent node
-            if next_agent == "planner":
-                node_updates = planner_node(state)
-            elif next_agent == "researcher":
-                node_updates = researcher_node(state)
-            elif next_agent == "booker":
-                node_updates = booker_node(state)
-            elif next_agent == "coordinator":
-                # coordinator may be scheduled as next_agent by planner/researcher/booker;
-                # call travel_coordinator to process returned parts/results.
-                node_updates = travel_coordinator(state)
-            else:
-                print(f"Unknown agent: {next_agent}")
-                break
-
-            # Merge node updates
-            if node_updates:
-                if "message_board" in node_updates:
-                    state.setdefault("message_board", [])
-                    state["message_board"] = node_updates["message_board"]
-                if "shared_state" in node_updates:
-                    state["shared_state"] = node_updates["shared_state"]
-                if "phase" in node_updates:
-                    state["phase"] = node_updates["phase"]
-                if "next_agent" in node_updates:
-                    state["next_agent"] = node_updates["next_agent"]
-                if "error" in node_updates:
-                    state["error"] = node_updates["error"]
-
-            # Decrement volley counter and possibly continue
-            state["volley_msg_left"] = state.get("volley_msg_left", 0) - 1
-
-            # small heartbeat so console doesn't flood (optional)
-            # time.sleep(0.1)
-
-            # Loop continues until auto completion
-
+        if LLM_STREAM:
+            # Show agent messages token by token instead of waiting for each completion
+            with token_sink(TerminalPrinter()):
+                run_session(state)
+        else:
+            run_session(state)
     except KeyboardInterrupt:
         print("\n\nPlanning interrupted by keyboard. Generating summary...\n")
         summarizer_node(state)
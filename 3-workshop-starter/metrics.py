@@ -0,0 +1,134 @@
+"""
+Token, latency and cost accounting for LLM calls, per agent and per session.
+
+main.run_session() binds state["metrics"] as the current session's metrics,
+and every invoke_llm call inside it (including calls from worker threads
+started by dispatch.run_concurrently) is added to it. summarizer_node prints
+the totals with the trip summary.
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+
+
+# USD per 1M tokens: (input, cached input, output). Update when pricing changes.
+MODEL_PRICES = {
+    "gpt-5": (1.25, 0.125, 10.00),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+    "gpt-5-nano": (0.05, 0.005, 0.40)
+}
+
+_current_metrics = contextvars.ContextVar("session_metrics", default=None)
+_lock = threading.Lock()
+
+
+def new_metrics():
+    """
+    Returns: An empty metrics section for State["metrics"]
+    """
+    return {"agents": {}, "totals": _empty_counters()}
+
+
+def _empty_counters():
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "completion_tokens": 0,
+        "latency_s": 0.0,
+        "streamed": 0,
+        "ttft_s": 0.0,
+        "cost_usd": 0.0,
+        "models": {}
+    }
+
+
+def call_cost(model, usage):
+    """
+    Estimated USD cost of one call, or 0.0 for models missing from MODEL_PRICES.
+
+    Args:
+        model: OpenAI model name
+        usage: Dict with prompt_tokens, cached_tokens, completion_tokens
+    """
+    prices = MODEL_PRICES.get(model)
+    if not prices:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    uncached = usage["prompt_tokens"] - usage["cached_tokens"]
+    return (
+        uncached * input_price
+        + usage["cached_tokens"] * cached_price
+        + usage["completion_tokens"] * output_price
+    ) / 1_000_000
+
+
+@contextmanager
+def session_metrics(metrics):
+    """
+    Record LLM calls made inside the block into `metrics` (from new_metrics()).
+    """
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def record_llm_call(agent, model, usage, latency, source="api", ttft=None):
+    """
+    Add one LLM call to the current session's metrics (no-op outside a session).
+
+    Args:
+        agent: Persona or component that made the call
+        model: OpenAI model name
+        usage: Dict with prompt_tokens, cached_tokens, completion_tokens
+        latency: Seconds spent waiting for the response
+        source: "api", "cache" or "replay"; response-cache hits cost nothing
+        ttft: Seconds to the first token for streamed calls, else None
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+
+    cost = 0.0 if source == "cache" else call_cost(model, usage)
+    with _lock:
+        agent_counters = metrics["agents"].setdefault(agent, _empty_counters())
+        for counters in (agent_counters, metrics["totals"]):
+            counters["calls"] += 1
+            counters["cache_hits"] += source == "cache"
+            counters["prompt_tokens"] += usage["prompt_tokens"]
+            counters["cached_tokens"] += usage["cached_tokens"]
+            counters["completion_tokens"] += usage["completion_tokens"]
+            counters["latency_s"] += latency
+            if ttft is not None:
+                counters["streamed"] += 1
+                counters["ttft_s"] += ttft
+            counters["cost_usd"] += cost
+            counters["models"][model] = counters["models"].get(model, 0) + 1
+
+
+def format_metrics(metrics):
+    """
+    Returns: A per-agent usage table, most expensive agent first ("" if no calls)
+    """
+    if not metrics or not metrics["totals"]["calls"]:
+        return ""
+
+    lines = [
+        "LLM Usage:",
+        f"{'agent':<16} {'calls':>5} {'prompt':>8} {'cached':>8} {'output':>8} "
+        f"{'latency s':>10} {'ttft s':>7} {'cost $':>9}  models"
+    ]
+    rows = sorted(metrics["agents"].items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+    for name, c in rows + [("total", metrics["totals"])]:
+        models = ", ".join(f"{model} x{count}" for model, count in c["models"].items())
+        # Mean time to first token over streamed calls
+        ttft = f"{c['ttft_s'] / c['streamed']:>7.2f}" if c["streamed"] else f"{'-':>7}"
+        lines.append(
+            f"{name:<16} {c['calls']:>5} {c['prompt_tokens']:>8} {c['cached_tokens']:>8} "
+            f"{c['completion_tokens']:>8} {c['latency_s']:>10.2f} {ttft} {c['cost_usd']:>9.5f}  {models}"
+        )
+    return "\n".join(lines)
@@ -1,11 +1,16 @@
 from typing import Dict, Any, Optional, List, Literal
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 
-from state import State, Task, Message
+from state import State, Task, Message, TravelRequest
 from tools.attractions import search_attractions
 from tools.weather import get_weather
-from tools.hotels import book_hotel
+from tools.hotels import HOTEL_PREFERENCES, book_hotel, quote_hotels
+from tools.inventory import SoldOutError
+from tools.itinerary import plan_itinerary
+from record_replay import session_random
+from tracing import traced
+from metrics import format_metrics
 
 
 def human_input_node(state: State) -> Dict[str, Any]:
@@ -25,11 +30,30 @@ def human_input_node(state: State) -> Dict[str, Any]:
     print("\nHow many guests?")
     guests = int(input("Number of guests: ").strip())
     
+    return initial_state({
+        "destination": destination,
+        "check_in": check_in,
+        "check_out": check_out,
+        "guests": guests,
+        "preferences": {}
+    })
+
+
+def initial_state(request: TravelRequest) -> Dict[str, Any]:
+    """
+    Build a fresh system state for a travel request (no console input).
+
+    Args:
+        request: TravelRequest with destination, dates and guests
+
+    Returns:
+        Initial State ready for main.run_session()
+    """
     # Compute a sensible number of auto rounds from dates
     try:
         from datetime import datetime as _dt
-        sd = _dt.strptime(check_in, "%Y-%m-%d")
-        ed = _dt.strptime(check_out, "%Y-%m-%d")
+        sd = _dt.strptime(request["check_in"], "%Y-%m-%d")
+        ed = _dt.strptime(request["check_out"], "%Y-%m-%d")
         nights = max(1, (ed - sd).days)
     except Exception:
         nights = 3
@@ -51,11 +75,11 @@ def human_input_node(state: State) -> Dict[str, Any]:
         },
         "current_agent": "planner",
         "request": {
-            "destination": destination,
-            "check_in": check_in,
-            "check_out": check_out,
-            "guests": guests,
-            "preferences": {}
+            "destination": request["destination"].strip().lower(),
+            "check_in": request["check_in"],
+            "check_out": request["check_out"],
+            "guests": int(request["guests"]),
+            "preferences": request.get("preferences") or {}
         },
         "phase": "planning",
         # Automatic mode controls
@@ -98,6 +122,7 @@ def check_completion(state: State) -> Literal["summarize", "continue"]:
     return "continue"
 
 
+@traced("node.planner")
 def planner_node(state: State) -> Dict[str, Any]:
     """
     Planner agent: Creates and assigns tasks, monitors progress
@@ -208,6 +233,7 @@ def planner_node(state: State) -> Dict[str, Any]:
     }
     
 
+@traced("node.researcher")
 def researcher_node(state: State) -> Dict[str, Any]:
     """
     Researcher agent: Searches attractions and gets weather forecasts
@@ -257,8 +283,11 @@ def researcher_node(state: State) -> Dict[str, Any]:
         # Get attractions (Action)
         attractions = search_attractions(
             my_task["params"]["location"],
-            radius_km=5,
-            top_n=5
+            radius_km=10,  # day trips like Arashiyama are ~9 km from Kyoto's center
+            top_n=5,
+            start_date=my_task["params"]["start_date"],
+            end_date=my_task["params"]["end_date"],
+            rng=session_random("researcher")
         )
         
         # Observation: attractions result
@@ -334,6 +363,7 @@ def researcher_node(state: State) -> Dict[str, Any]:
     }
 
 
+@traced("node.booker")
 def booker_node(state: State) -> Dict[str, Any]:
     """
     Booker agent: Makes hotel reservations
@@ -381,13 +411,43 @@ def booker_node(state: State) -> Dict[str, Any]:
         })
 
         print("Searching for available hotels...")
-        # Make booking
-        booking = book_hotel(
-            location=my_task["params"]["location"],
-            check_in=my_task["params"]["check_in"],
-            check_out=my_task["params"]["check_out"],
-            guests=my_task["params"]["guests"]
+        # Price every hotel in one call, filtered by the traveller's preferences
+        params = my_task["params"]
+        preferences = state["request"].get("preferences") or {}
+        offers = quote_hotels(
+            location=params["location"],
+            check_in=params["check_in"],
+            check_out=params["check_out"],
+            guests=params["guests"],
+            **{key: preferences[key] for key in HOTEL_PREFERENCES if key in preferences}
         )
+        if not offers:
+            raise ValueError(f"No hotels in {params['location']} match the request")
+
+        board.append({
+            "timestamp": datetime.now(),
+            "agent": "booker",
+            "content": f"Observation: {len(offers)} offers, best {offers[0]['hotel']['name']} at {offers[0]['total_price']}",
+            "payload": {"offers": len(offers)}
+        })
+
+        # Book the best offer; another session may take the last room first
+        booking = None
+        for offer in offers:
+            try:
+                booking = book_hotel(
+                    location=params["location"],
+                    check_in=params["check_in"],
+                    check_out=params["check_out"],
+                    guests=params["guests"],
+                    hotel_id=offer["hotel"]["id"],
+                    rng=session_random("booker")
+                )
+                break
+            except SoldOutError:
+                continue
+        if booking is None:
+            raise SoldOutError(f"All matching hotels in {params['location']} sold out")
         
         # Store booking
         shared["bookings"].append(booking)
@@ -439,6 +499,57 @@ def booker_node(state: State) -> Dict[str, Any]:
     }
 
 
+def build_itinerary(request: TravelRequest, attractions: List[Dict[str, Any]],
+                    weather: Dict[str, Any], booking: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Assemble the final itinerary stored in shared_state["itinerary"].
+
+    Returns:
+        Dict with trip details, hotel, attractions, day-by-day routes and daily weather
+    """
+    hotel = booking["hotel"]
+    plan = plan_itinerary(
+        attractions,
+        date.fromisoformat(request["check_in"]),
+        date.fromisoformat(request["check_out"]),
+        hotel=(hotel["lat"], hotel["lon"]) if "lat" in hotel else None
+    )
+    return {
+        "destination": request["destination"],
+        "check_in": request["check_in"],
+        "check_out": request["check_out"],
+        "guests": request["guests"],
+        "hotel": {
+            "name": booking["hotel"]["name"],
+            "confirmation_code": booking["confirmation_code"],
+            "total_price": booking["total_price"],
+            "currency": booking["currency"],
+            "cancellation_policy": booking["cancellation_policy"]
+        },
+        "attractions": [
+            {
+                "name": poi["name"],
+                "description": poi["description"],
+                "visit_duration": poi["visit_duration"]
+            }
+            for poi in attractions
+        ],
+        "days": plan["days"],
+        "unscheduled": plan["unscheduled"],
+        "weather": weather["daily"]
+    }
+
+
+def print_usage(state: State) -> None:
+    """
+    Print the session's LLM tokens, latency and cost per agent, if any calls were made.
+    """
+    usage = format_metrics(state.get("metrics"))
+    if usage:
+        print(f"\n{usage}")
+
+
+@traced("node.summarizer")
 def summarizer_node(state: State) -> Dict[str, Any]:
     """
     Generate final trip summary and itinerary
@@ -452,6 +563,7 @@ def summarizer_node(state: State) -> Dict[str, Any]:
     if state.get("error"):
         print(f"Error occurred: {state['error']}")
         print("\nUnable to complete trip planning. Please try again.")
+        print_usage(state)
         return {}
         
     # Get results
@@ -461,7 +573,10 @@ def summarizer_node(state: State) -> Dict[str, Any]:
     
     if not (attractions and weather and booking):
         print("Missing required information. Please try again.")
+        print_usage(state)
         return {}
+
+    itinerary = shared["itinerary"] = build_itinerary(request, attractions, weather, booking)
         
     # Print summary
     print(f"Trip to {request['destination'].title()}")
@@ -474,12 +589,18 @@ def summarizer_node(state: State) -> Dict[str, Any]:
     print(f"- Total: ${booking['total_price']} {booking['currency']}")
     print(f"- {booking['cancellation_policy']}\n")
     
-    print("Top Attractions:")
-    for i, poi in enumerate(attractions, 1):
-        print(f"{i}. {poi['name']}")
-        print(f"   {poi['description']}")
-        print(f"   Visit duration: {poi['visit_duration']} hours")
+    print("Day-by-Day Plan:")
+    for day in itinerary["days"]:
+        if not day["stops"]:
+            print(f"- {day['date']}: free day\n")
+            continue
+        print(f"- {day['date']} ({day['travel_km']} km of travel, back at the hotel after {day['hours']} hours)")
+        for stop in day["stops"]:
+            crowd = f", {stop['crowd_level']} crowds" if stop["crowd_level"] else ""
+            print(f"  {stop['arrive']}-{stop['leave']}  {stop['name']}{crowd}")
         print()
+    if itinerary["unscheduled"]:
+        print(f"Didn't fit: {', '.join(itinerary['unscheduled'])}\n")
         
     print("Weather Forecast:")
     for day in weather["daily"]:
@@ -488,5 +609,6 @@ def summarizer_node(state: State) -> Dict[str, Any]:
         print(f"  Rain chance: {int(day['precipitation_probability'] * 100)}%\n")
         
     print("\nHave a great trip!")
-    
-    return {}
+    print_usage(state)
+
+    return {"shared_state": shared}
@@ -0,0 +1,293 @@
+"""
+Record/replay of LLM and HTTP traffic for offline, deterministic runs.
+
+RECORD_MODE=record   Run normally and append every LLM call (invoke_llm) and
+                     HTTP exchange (shared tools clients) to RECORD_FILE.
+RECORD_MODE=replay   Serve those responses from RECORD_FILE without touching
+                     the network, sleeping REPLAY_LATENCY_SCALE x the recorded
+                     latency (0 = instant, 1 = as recorded).
+
+In both modes the simulated tools are seeded with RECORD_SEED so two runs make
+the same choices. main.run_session() binds per-session RNGs with
+session_random_streams(), and each agent draws from its own named stream
+(session_random("booker")), so concurrent agents never interleave their
+draws from one shared generator.
+"""
+
+import asyncio
+import base64
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import httpx
+from langchain.schema import AIMessage
+
+
+RECORD_MODE = os.getenv("RECORD_MODE", "off").lower()  # off | record | replay
+RECORD_FILE = os.getenv("RECORD_FILE", "session_trace.jsonl")
+RECORD_SEED = int(os.getenv("RECORD_SEED", "0"))
+REPLAY_LATENCY_SCALE = float(os.getenv("REPLAY_LATENCY_SCALE", "0"))
+
+
+class ReplayMissError(KeyError):
+    """Raised when replay has no recorded response for a request."""
+
+
+class SessionTrace:
+    """
+    One trace file, either being recorded or replayed.
+    """
+
+    def __init__(self, mode, path, latency_scale=REPLAY_LATENCY_SCALE):
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._llm_by_key = defaultdict(deque)
+            self._llm_by_agent = defaultdict(deque)
+            self._http = defaultdict(deque)
+            self._last_http = {}
+            self._load()
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    # --- recording -------------------------------------------------------------
+
+    def _write(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def record_llm(self, key, model, temperature, agent, response, latency):
+        self._write({
+            "kind": "llm",
+            "key": key,
+            "model": model,
+            "temperature": temperature,
+            "agent": agent,
+            "latency": latency,
+            "content": response.content,
+            "usage_metadata": getattr(response, "usage_metadata", None),
+            "response_metadata": {
+                k: v for k, v in (getattr(response, "response_metadata", None) or {}).items() if k != "cache"
+            }
+        })
+
+    def record_http(self, request, response, latency):
+        body = response.content
+        try:
+            body_text, encoding = body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body_text, encoding = base64.b64encode(body).decode("ascii"), "base64"
+
+        # The stored body is already decoded, so drop headers describing the wire format
+        headers = [
+            (k, v) for k, v in response.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        self._write({
+            "kind": "http",
+            "method": request.method,
+            "url": str(request.url),
+            "latency": latency,
+            "status": response.status_code,
+            "headers": headers,
+            "body": body_text,
+            "body_encoding": encoding
+        })
+
+    # --- replay ----------------------------------------------------------------
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["kind"] == "llm":
+                    self._llm_by_key[event["key"]].append(event)
+                    self._llm_by_agent[event["agent"]].append(event)
+                elif event["kind"] == "http":
+                    self._http[(event["method"], event["url"])].append(event)
+
+    def _take_llm(self, key, agent):
+        """
+        Next recording for this exact prompt, else the agent's next recording in order.
+        """
+        with self._lock:
+            for queue in (self._llm_by_key.get(key), self._llm_by_agent.get(agent)):
+                while queue:
+                    event = queue.popleft()
+                    if not event.get("used"):
+                        event["used"] = True
+                        return event
+        raise ReplayMissError(f"No recorded LLM response for agent {agent!r}")
+
+    def replay_llm(self, key, agent):
+        event = self._take_llm(key, agent)
+        time.sleep(event["latency"] * self.latency_scale)
+        return AIMessage(
+            content=event["content"],
+            usage_metadata=event.get("usage_metadata"),
+            response_metadata={**event.get("response_metadata", {}), "replayed": True}
+        )
+
+    def _take_http(self, request):
+        request_key = (request.method, str(request.url))
+        with self._lock:
+            queue = self._http.get(request_key)
+            if queue:
+                # Keep serving the last exchange once the recorded ones run out
+                self._last_http[request_key] = queue.popleft()
+            event = self._last_http.get(request_key)
+        if event is None:
+            raise ReplayMissError(f"No recorded HTTP response for {request.method} {request.url}")
+        return event
+
+    def http_response(self, request, event):
+        body = event["body"]
+        content = base64.b64decode(body) if event["body_encoding"] == "base64" else body.encode("utf-8")
+        return httpx.Response(event["status"], headers=event["headers"], content=content, request=request)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sync transport that records every exchange passing through it."""
+
+    def __init__(self, inner, trace):
+        self.inner = inner
+        self.trace = trace
+
+    def handle_request(self, request):
+        start = time.perf_counter()
+        response = self.inner.handle_request(request)
+        response.read()
+        self.trace.record_http(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async transport that records every exchange passing through it."""
+
+    def __init__(self, inner, trace):
+        self.inner = inner
+        self.trace = trace
+
+    async def handle_async_request(self, request):
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        self.trace.record_http(request, response, time.perf_counter() - start)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Sync transport that serves recorded responses instead of the network."""
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def handle_request(self, request):
+        event = self.trace._take_http(request)
+        time.sleep(event["latency"] * self.trace.latency_scale)
+        return self.trace.http_response(request, event)
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """Async transport that serves recorded responses instead of the network."""
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    async def handle_async_request(self, request):
+        event = self.trace._take_http(request)
+        await asyncio.sleep(event["latency"] * self.trace.latency_scale)
+        return self.trace.http_response(request, event)
+
+
+_trace = None
+_trace_lock = threading.Lock()
+
+
+def get_session_trace():
+    """
+    Returns: The process-wide SessionTrace, or None when RECORD_MODE is off
+    """
+    global _trace
+    if RECORD_MODE not in ("record", "replay"):
+        return None
+    with _trace_lock:
+        if _trace is None:
+            _trace = SessionTrace(RECORD_MODE, RECORD_FILE)
+        return _trace
+
+
+_session_rngs = contextvars.ContextVar("session_rngs", default=None)
+
+
+@contextmanager
+def session_random_streams(seed=None):
+    """
+    Give the session run inside the block its own random streams.
+
+    Args:
+        seed: Base seed; defaults to RECORD_SEED when recording or replaying,
+            otherwise fresh entropy per session
+    """
+    if seed is None and RECORD_MODE in ("record", "replay"):
+        seed = RECORD_SEED
+    token = _session_rngs.set({"seed": seed, "streams": {}, "lock": threading.Lock()})
+    try:
+        yield
+    finally:
+        _session_rngs.reset(token)
+
+
+def session_random(stream):
+    """
+    Returns: The current session's random.Random for `stream` (one per agent),
+        or the global random module outside a session
+    """
+    rngs = _session_rngs.get()
+    if rngs is None:
+        return random
+    with rngs["lock"]:
+        rng = rngs["streams"].get(stream)
+        if rng is None:
+            seed = rngs["seed"]
+            rng = rngs["streams"][stream] = random.Random(None if seed is None else f"{seed}:{stream}")
+        return rng
+
+
+def wrap_transport(inner, is_async=False):
+    """
+    Wrap an httpx transport for the current RECORD_MODE (unchanged when off).
+    """
+    trace = get_session_trace()
+    if trace is None:
+        return inner
+    if trace.replaying:
+        return AsyncReplayTransport(trace) if is_async else ReplayTransport(trace)
+    return AsyncRecordingTransport(inner, trace) if is_async else RecordingTransport(inner, trace)
@@ -0,0 +1,314 @@
+"""
+ASGI HTTP service for the travel planner.
+
+Endpoints:
+    POST /sessions               Body: TravelRequest JSON. Starts a planning session (202)
+    GET  /sessions/{id}/events   Server-sent events: one "entry" per message-board post,
+                                 then "itinerary" (or "error") when the session ends
+    GET  /sessions/{id}          Session status, and the itinerary once finished
+    GET  /graph                  The workflow graph (ASCII)
+    GET  /healthz                Liveness and session counts
+
+Plain ASGI with no web framework. Serve it with any ASGI server, e.g.:
+
+    pip install "travelagent[server]"
+    uvicorn server:app --port 8000
+
+The workflow graph is compiled once at startup and every session runs it as
+a task on the event loop (main.arun_session). A session only takes a thread
+while one of its nodes makes a blocking LLM or tool call, from a pool of
+NODE_WORKERS shared by all sessions, so hundreds of sessions can be planning
+at once. Event streams are plain coroutines too. Node progress output is
+discarded unless SERVER_VERBOSE=true, in which case it goes to stderr.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+from agents.llm import LLM_WARMUP, warm_up  # noqa: E402
+from main import arun_session, session_graph  # noqa: E402
+from nodes import initial_state  # noqa: E402
+from tools.http_client import close_clients  # noqa: E402
+from batch import parse_request  # noqa: E402
+
+
+# Sessions held in memory (running or finished) before new ones are refused
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+# How long finished sessions stay available for /events and /sessions/{id}
+SESSION_TTL = float(os.getenv("SESSION_TTL", "600"))  # seconds
+SSE_KEEPALIVE = 15  # seconds between comment pings on an idle stream
+# Show node progress output on stderr instead of discarding it
+SERVER_VERBOSE = os.getenv("SERVER_VERBOSE", "false").lower() == "true"
+
+
+class Session:
+    """
+    One planning session, run as a task on the event loop and read by event streams.
+
+    Board entries are appended on the event loop, so readers never race with
+    the session.
+    """
+
+    def __init__(self, request):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.status = "queued"  # queued | running | done | error
+        self.entries = []
+        self.result = None
+        self.error = None
+        self.finished_at = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _add_entry(self, entry):
+        self.entries.append(entry)
+        self._notify()
+
+    def _finish(self, status, result, error):
+        self.status, self.result, self.error = status, result, error
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+    async def wait_for_change(self, timeout):
+        """
+        Returns: False if nothing changed within `timeout` seconds
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def run(self):
+        """
+        Plan the trip through the shared graph.
+        """
+        self.status = "running"
+
+        def on_board_entry(entry):
+            self._add_entry({
+                "agent": entry.get("agent"),
+                "content": entry.get("content"),
+                "timestamp": entry["timestamp"].isoformat() if entry.get("timestamp") else None
+            })
+
+        try:
+            state = await arun_session(initial_state(self.request), on_board_entry=on_board_entry)
+            shared = state["shared_state"]
+            result = {
+                "itinerary": shared.get("itinerary"),
+                "bookings": shared.get("bookings", []),
+                "usage": state["metrics"]["totals"]
+            }
+            error = state.get("error") or (None if shared.get("itinerary") else "Planning incomplete")
+            self._finish("error" if error else "done", result, error)
+        except Exception as e:
+            self._finish("error", None, str(e))
+
+    def to_dict(self):
+        data = {"id": self.id, "status": self.status, "request": self.request, "entries": len(self.entries)}
+        if self.finished:
+            data.update(self.result or {})
+            data["error"] = self.error
+        return data
+
+
+class TravelPlannerApp:
+    """
+    The ASGI application. One instance per process (see `app` below).
+    """
+
+    def __init__(self):
+        self.graph_ascii = None  # drawn on first GET /graph
+        self.sessions = {}
+        self.tasks = set()  # running session tasks, referenced until they finish
+        self.started = False
+        self._output = contextlib.ExitStack()
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def startup(self):
+        self.started = True
+        # Nodes print progress; keep it off the server's stdout
+        session_output = sys.stderr if SERVER_VERBOSE else self._output.enter_context(open(os.devnull, "w"))
+        self._output.enter_context(contextlib.redirect_stdout(session_output))
+
+        session_graph()
+        if LLM_WARMUP:
+            warm_up()
+
+    def shutdown(self):
+        for task in self.tasks:
+            task.cancel()
+        close_clients()
+        self._output.close()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    self.startup()
+                    await send({"type": "lifespan.startup.complete"})
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # --- ASGI entry point ------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        # Servers without lifespan support still get a compiled graph
+        if not self.started:
+            self.startup()
+
+        method, path = scope["method"], scope["path"].rstrip("/")
+        parts = path.strip("/").split("/")
+
+        if method == "POST" and path == "/sessions":
+            return await self.create_session(receive, send)
+        if method == "GET" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "events":
+            return await self.stream_events(parts[1], send)
+        if method == "GET" and len(parts) == 2 and parts[0] == "sessions":
+            return await self.get_session(parts[1], send)
+        if method == "GET" and path == "/graph":
+            if self.graph_ascii is None:
+                self.graph_ascii = session_graph().get_graph().draw_ascii()
+            return await send_text(send, 200, self.graph_ascii)
+        if method == "GET" and path == "/healthz":
+            running = sum(not s.finished for s in self.sessions.values())
+            return await send_json(send, 200, {"status": "ok", "sessions": len(self.sessions), "running": running})
+        return await send_json(send, 404, {"error": "Not found"})
+
+    # --- handlers --------------------------------------------------------------
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [
+            sid for sid, s in self.sessions.items()
+            if s.finished_at is not None and now - s.finished_at > SESSION_TTL
+        ]
+        for sid in expired:
+            del self.sessions[sid]
+
+    async def create_session(self, receive, send):
+        try:
+            request = parse_request(await read_body(receive))
+        except ValueError as e:
+            return await send_json(send, 400, {"error": str(e)})
+
+        self._purge_expired()
+        if len(self.sessions) >= MAX_SESSIONS:
+            return await send_json(send, 503, {"error": "Too many sessions, try again later"})
+
+        session = Session(request)
+        self.sessions[session.id] = session
+        task = asyncio.create_task(session.run())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+        return await send_json(send, 202, {
+            "id": session.id,
+            "status": session.status,
+            "events": f"/sessions/{session.id}/events",
+            "result": f"/sessions/{session.id}"
+        })
+
+    async def get_session(self, session_id, send):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return await send_json(send, 404, {"error": "Unknown session"})
+        return await send_json(send, 200, session.to_dict())
+
+    async def stream_events(self, session_id, send):
+        """
+        Replay the session's entries so far, then follow it until it finishes.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return await send_json(send, 404, {"error": "Unknown session"})
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no")
+            ]
+        })
+
+        sent = 0
+        while True:
+            entries = session.entries[sent:]
+            for entry in entries:
+                await send_event(send, "entry", entry)
+            sent += len(entries)
+
+            if session.finished:
+                if session.status == "done":
+                    await send_event(send, "itinerary", session.result)
+                else:
+                    await send_event(send, "error", {"error": session.error, **(session.result or {})})
+                break
+
+            if not await session.wait_for_change(SSE_KEEPALIVE):
+                await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+# --- ASGI helpers ---------------------------------------------------------------
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def send_text(send, status, text, content_type=b"text/plain; charset=utf-8"):
+    body = text.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_json(send, status, data):
+    await send_text(send, status, json.dumps(data, default=str), b"application/json")
+
+
+async def send_event(send, event, data):
+    payload = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    await send({"type": "http.response.body", "body": payload.encode("utf-8"), "more_body": True})
+
+
+app = TravelPlannerApp()
@@ -72,4 +72,12 @@ class State(TypedDict):
     # Optional fields for flow control
     phase: str  # "planning", "research", "booking", "summary"
     next_agent: Optional[str]
+    next_speaker: Optional[str]  # First agent to run when no next_agent is set
+    volley_msg_left: int  # Agent turns left before the session is summarized
+    next_agents: Optional[List[str]]  # Agents dispatched together in one turn
+    routing_stats: Optional[Dict[str, int]]  # {"fast_path": n, "llm": m} coordinator decisions
+    turn_stats: Optional[Dict[str, int]]  # {"coordinator": n, "agents": m} turns run by main.run_session
+    metrics: Optional[Dict[str, Any]]  # LLM tokens, latency and cost per agent, see metrics.py
+    transcripts: Optional[Dict[str, Any]]  # Rendered message history, see agents/transcript.py
+    context_windows: Optional[Dict[str, Any]]  # Rolling summaries, see agents/context.py
     error: Optional[str]
\ No newline at end of file
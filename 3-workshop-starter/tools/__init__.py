@@ -3,8 +3,10 @@ Tools module for Singapore Kopitiam project.
 """
 
 from .singapore_time import singapore_time
-from .singapore_weather import singapore_weather
+from .singapore_weather import singapore_weather, singapore_weather_async, weather_cache_stats
 from .singapore_news import singapore_news
+from .http_client import get_client, get_async_client, close_clients
 from .test import test_print_all
 
-__all__ = ['singapore_time', 'singapore_weather', 'singapore_news', 'test_print_all']
+__all__ = ['singapore_time', 'singapore_weather', 'singapore_weather_async', 'weather_cache_stats', 'singapore_news',
+           'get_client', 'get_async_client', 'close_clients', 'test_print_all']
@@ -1,6 +1,11 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import random
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
+
+from tracing import traced
+from tools.crowds import CrowdForecast
+from tools.spatial import PoiIndex, suggest_cell_km
 
 # Simulated POI database
 SAMPLE_ATTRACTIONS = {
@@ -53,7 +58,56 @@ SAMPLE_ATTRACTIONS = {
     ]
 }
 
-def search_attractions(location: str, radius_km: float, top_n: int) -> List[Dict[str, Any]]:
+# Radius queries are measured from here unless a center is given
+CITY_CENTERS = {
+    "kyoto": (35.0116, 135.7681)
+}
+
+_indexes = {}  # city -> PoiIndex, built on first search
+_index_lock = threading.Lock()
+
+
+def register_attractions(location: str, pois: List[Dict[str, Any]],
+                         center: Optional[Tuple[float, float]] = None) -> None:
+    """
+    Add or replace a city's attraction catalog (e.g. tens of thousands of POIs).
+
+    Args:
+        location: City name
+        pois: Dicts with name, type, rating, lat, lon, description, visit_duration
+        center: (lat, lon) used when searches don't pass one; defaults to the mean position
+    """
+    location = location.lower()
+    if center is None and pois:
+        center = (sum(p["lat"] for p in pois) / len(pois), sum(p["lon"] for p in pois) / len(pois))
+
+    with _index_lock:
+        SAMPLE_ATTRACTIONS[location] = pois
+        if center:
+            CITY_CENTERS[location] = center
+        _indexes.pop(location, None)
+
+
+def get_attraction_index(location: str) -> Optional[PoiIndex]:
+    """
+    Returns: The city's spatial index, built once per catalog (None for unknown cities)
+    """
+    location = location.lower()
+    with _index_lock:
+        index = _indexes.get(location)
+        if index is None and location in SAMPLE_ATTRACTIONS:
+            pois = SAMPLE_ATTRACTIONS[location]
+            index = PoiIndex(pois, cell_km=suggest_cell_km(pois))
+            _indexes[location] = index
+        return index
+
+
+@traced("tool.search_attractions")
+def search_attractions(location: str, radius_km: float, top_n: int,
+                       center: Optional[Tuple[float, float]] = None,
+                       start_date: Optional[str] = None,
+                       end_date: Optional[str] = None,
+                       rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
     """
     Simulated attraction search using OpenTripMap-like API.
     
@@ -61,33 +115,29 @@ def search_attractions(location: str, radius_km: float, top_n: int) -> List[Dict
         location: City name (only "kyoto" supported in demo)
         radius_km: Search radius in kilometers
         top_n: Number of results to return
+        center: (lat, lon) to search around; defaults to the city center
+        start_date: First day of the trip (ISO format); defaults to today
+        end_date: Last day of the trip (ISO format); defaults to a week from start_date
+        rng: Random source for the simulated crowd levels; the random module by default
     
     Returns:
-        List of attractions with details
+        Best-rated attractions within the radius, with distance_km from the
+        center and a lazily generated crowd_forecast (CrowdForecast) for the trip
     """
     location = location.lower()
-    if location not in SAMPLE_ATTRACTIONS:
+    index = get_attraction_index(location)
+    if index is None:
         return []
+
+    lat, lon = center or CITY_CENTERS[location]
+    results = index.query(lat, lon, radius_km, top_n)
     
-    # Simulate some randomness in results
-    attractions = SAMPLE_ATTRACTIONS[location].copy()
-    random.shuffle(attractions)
-    
-    # Filter by radius (simplified)
-    results = attractions[:min(top_n, len(attractions))]
-    
-    # Add simulated visit times
-    now = datetime.now()
+    # Add simulated crowd levels for the trip's days (generated on first read)
+    start = datetime.fromisoformat(start_date).date() if start_date else date.today()
+    end = datetime.fromisoformat(end_date).date() if end_date else start + timedelta(days=6)
+    days = (end - start).days + 1
+    rng = rng or random
     for attraction in results:
-        # Add random crowd levels for next few days
-        crowd_forecast = []
-        for i in range(7):
-            date = now + timedelta(days=i)
-            crowd_forecast.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "crowd_level": random.choice(["low", "medium", "high"]),
-                "best_time": random.choice(["morning", "afternoon", "evening"])
-            })
-        attraction["crowd_forecast"] = crowd_forecast
+        attraction["crowd_forecast"] = CrowdForecast(start, days, seed=rng.getrandbits(63))
     
     return results
\ No newline at end of file
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """
+    Thread-safe, process-wide cache with time-to-live and stale-while-revalidate.
+
+    - Fresh entries (younger than `ttl`) are returned immediately.
+    - Stale entries (older than `ttl` but younger than `max_stale`) are also
+      returned immediately, while a single background thread refreshes them.
+    - Missing or expired entries are loaded synchronously. Concurrent callers
+      asking for the same key wait for one shared load instead of each
+      calling the loader.
+
+    A loader that raises is never cached; the exception propagates on a miss
+    and is counted (then ignored) during a background refresh.
+    """
+
+    def __init__(self, ttl, max_stale=None):
+        """
+        Args:
+            ttl: Seconds an entry is considered fresh
+            max_stale: Seconds after which a stale entry is no longer served
+                (None serves stale entries indefinitely)
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries = {}  # key -> (value, stored_at)
+        self._inflight = {}  # key -> Future for a running load/refresh
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0
+        }
+
+    def get(self, key, loader):
+        """
+        Return the cached value for `key`, calling `loader()` when needed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+
+                if age < self.ttl:
+                    self._counters["hits"] += 1
+                    return value
+
+                if self.max_stale is None or age < self.max_stale:
+                    self._counters["stale_hits"] += 1
+                    if key not in self._inflight:
+                        self._inflight[key] = Future()
+                        threading.Thread(
+                            target=self._refresh, args=(key, loader), daemon=True
+                        ).start()
+                    return value
+
+            self._counters["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def _refresh(self, key, loader):
+        """
+        Background refresh of a stale entry.
+        """
+        with self._lock:
+            future = self._inflight[key]
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._counters["refresh_errors"] += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._counters["refreshes"] += 1
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def clear(self):
+        """
+        Drop all entries (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns: Dict with hit/stale/miss/refresh counters and current size
+        """
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
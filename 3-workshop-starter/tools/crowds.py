@@ -0,0 +1,119 @@
+"""
+Compact, lazily generated crowd forecasts for attractions.
+
+A CrowdForecast only stores its seed and the dates it covers. The crowd
+levels and best visiting times are generated as two small uint8 arrays the
+first time they are read. Per-day dicts are only built for callers that index
+or iterate it like the old list of dicts.
+
+Forecasts are immutable, so copying one (including copy.deepcopy of the
+shared state in dispatch) returns the same object.
+"""
+
+import random
+from collections.abc import Sequence
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+CROWD_LEVELS = ("low", "medium", "high")
+BEST_TIMES = ("morning", "afternoon", "evening")
+
+
+class CrowdForecast(Sequence):
+    """
+    Crowd level and best time to visit for each day from `start`.
+
+    Args:
+        start: First day covered
+        days: Number of days covered
+        seed: Seed for the generated levels; random if not given
+    """
+
+    __slots__ = ("start", "days", "seed", "_levels", "_best_times")
+
+    def __init__(self, start: date, days: int, seed: Optional[int] = None):
+        self.start = start
+        self.days = max(0, days)
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self._levels = None
+        self._best_times = None
+
+    def _materialize(self):
+        rng = np.random.default_rng((self.seed, self.start.toordinal()))
+        values = rng.integers(0, 3, size=(2, self.days), dtype=np.uint8)
+        self._levels, self._best_times = values[0], values[1]
+
+    @property
+    def levels(self) -> np.ndarray:
+        """
+        Returns: uint8 index into CROWD_LEVELS per day
+        """
+        if self._levels is None:
+            self._materialize()
+        return self._levels
+
+    @property
+    def best_times(self) -> np.ndarray:
+        """
+        Returns: uint8 index into BEST_TIMES per day
+        """
+        if self._best_times is None:
+            self._materialize()
+        return self._best_times
+
+    @property
+    def end(self) -> date:
+        """Last day covered."""
+        return self.start + timedelta(days=self.days - 1)
+
+    @property
+    def materialized(self) -> bool:
+        return self._levels is not None
+
+    def index_of(self, day: date) -> Optional[int]:
+        """
+        Returns: Position of `day` in the forecast, or None if not covered
+        """
+        offset = (day - self.start).days
+        return offset if 0 <= offset < self.days else None
+
+    def level_on(self, day: date) -> Optional[str]:
+        """
+        Returns: The crowd level on `day`, or None if not covered
+        """
+        offset = self.index_of(day)
+        return None if offset is None else CROWD_LEVELS[self.levels[offset]]
+
+    def __len__(self):
+        return self.days
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.days))]
+        if index < 0:
+            index += self.days
+        if not 0 <= index < self.days:
+            raise IndexError("crowd forecast index out of range")
+        return {
+            "date": (self.start + timedelta(days=index)).strftime("%Y-%m-%d"),
+            "crowd_level": CROWD_LEVELS[self.levels[index]],
+            "best_time": BEST_TIMES[self.best_times[index]]
+        }
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """
+        Returns: The forecast as the per-day dicts search_attractions used to return
+        """
+        return list(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"CrowdForecast({self.start.isoformat()}, days={self.days})"
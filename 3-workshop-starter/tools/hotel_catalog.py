@@ -0,0 +1,146 @@
+"""
+Array-backed hotel catalog for pricing every hotel in a city at once.
+
+The hotel dicts are turned into NumPy columns once per catalog: ratings, base
+prices, a price-range code and an amenity matrix (hotels x amenities). A quote
+then filters and prices all hotels with a few vectorized operations and only
+builds dicts for the offers it returns.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+
+# Nightly base price per room by price range
+BASE_PRICES = {
+    "luxury": 500,
+    "upscale": 250,
+    "moderate": 150
+}
+DEFAULT_BASE_PRICE = 200
+EXTRA_GUEST_RATE = 0.5  # 50% extra per additional guest
+SORT_KEYS = ("price", "rating")
+
+
+def base_price(hotel: Dict[str, Any]) -> float:
+    """
+    Returns: The hotel's own "base_price", else the price for its price range
+    """
+    return hotel.get("base_price") or BASE_PRICES.get(hotel.get("price_range"), DEFAULT_BASE_PRICE)
+
+
+def stay_price(base, nights, guests, rooms=1):
+    """
+    Total price of a stay. Works on scalars or NumPy arrays of base prices.
+    """
+    return base * nights * (1 + (guests - 1) * EXTRA_GUEST_RATE) * rooms
+
+
+def _as_list(value: Union[None, str, Iterable[str]]) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class HotelCatalog:
+    """
+    Vectorized filter, price and rank over one city's hotels.
+
+    Args:
+        hotels: Hotel dicts with "id", "rating", "price_range", "amenities"
+            and optionally "base_price"
+    """
+
+    def __init__(self, hotels: List[Dict[str, Any]]):
+        self.hotels = hotels
+        self.ids = [hotel["id"] for hotel in hotels]
+        count = len(hotels)
+
+        self.rating = np.fromiter((h.get("rating", 0) for h in hotels), dtype=np.float64, count=count)
+        self.base_price = np.fromiter((base_price(h) for h in hotels), dtype=np.float64, count=count)
+
+        ranges = sorted({h.get("price_range") or "" for h in hotels})
+        self.range_codes = {name: code for code, name in enumerate(ranges)}
+        self.price_range = np.fromiter(
+            (self.range_codes[h.get("price_range") or ""] for h in hotels), dtype=np.int16, count=count
+        )
+
+        amenities = sorted({a for h in hotels for a in h.get("amenities", ())})
+        self.amenity_columns = {name: column for column, name in enumerate(amenities)}
+        self.amenities = np.zeros((count, len(amenities)), dtype=bool)
+        for row, hotel in enumerate(hotels):
+            for name in hotel.get("amenities", ()):
+                self.amenities[row, self.amenity_columns[name]] = True
+
+    def __len__(self):
+        return len(self.hotels)
+
+    def match(self, min_rating: Optional[float] = None,
+              amenities: Union[None, str, Iterable[str]] = None,
+              price_range: Union[None, str, Iterable[str]] = None) -> np.ndarray:
+        """
+        Returns: Boolean mask of hotels with every requested amenity, a rating of
+            at least min_rating and one of the given price ranges
+        """
+        mask = np.ones(len(self.hotels), dtype=bool)
+        if min_rating is not None:
+            mask &= self.rating >= min_rating
+
+        wanted = _as_list(amenities)
+        if wanted:
+            if any(name not in self.amenity_columns for name in wanted):
+                return np.zeros_like(mask)  # nobody has an amenity we've never seen
+            mask &= self.amenities[:, [self.amenity_columns[name] for name in wanted]].all(axis=1)
+
+        ranges = _as_list(price_range)
+        if ranges:
+            codes = [self.range_codes[name] for name in ranges if name in self.range_codes]
+            mask &= np.isin(self.price_range, codes)
+        return mask
+
+    def quote(self, nights: int, guests: int, rooms: int = 1,
+              mask: Optional[np.ndarray] = None, max_price: Optional[float] = None,
+              sort_by: str = "price", top_n: Optional[int] = None):
+        """
+        Price the stay at every hotel in `mask` and rank the offers.
+
+        Args:
+            nights: Nights in the stay
+            guests: Number of guests
+            rooms: Rooms booked for every night
+            mask: Hotels to consider (from match()); default all
+            max_price: Drop offers whose total is above this
+            sort_by: "price" (cheapest first, better rated on ties) or
+                "rating" (best rated first, cheaper on ties)
+            top_n: Keep only the best top_n offers
+
+        Returns:
+            (positions in self.hotels, total prices), both in rank order
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {SORT_KEYS}")
+
+        positions = np.arange(len(self.hotels)) if mask is None else np.flatnonzero(mask)
+        totals = stay_price(self.base_price[positions], nights, guests, rooms)
+        if max_price is not None:
+            keep = totals <= max_price
+            positions, totals = positions[keep], totals[keep]
+
+        ratings = self.rating[positions]
+        primary, secondary = (totals, -ratings) if sort_by == "price" else (-ratings, totals)
+
+        # Large catalogs: drop everything ranked below the top_n-th primary key
+        # (ties kept) in one pass, so only a handful of offers get sorted
+        if top_n is not None and 0 < top_n and len(primary) > 4 * top_n:
+            keep = primary <= np.partition(primary, top_n - 1)[top_n - 1]
+            positions, totals = positions[keep], totals[keep]
+            primary, secondary = primary[keep], secondary[keep]
+
+        # np.lexsort sorts by the last key first
+        order = np.lexsort((secondary, primary))
+        if top_n is not None:
+            order = order[:top_n]
+        return positions[order], totals[order]
@@ -1,6 +1,11 @@
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from datetime import date, datetime
 import random
+import threading
+
+from tracing import traced
+from tools.hotel_catalog import HotelCatalog, base_price, stay_price
+from tools.inventory import HotelInventory, SoldOutError
 
 # Simulated hotel database
 SAMPLE_HOTELS = {
@@ -12,7 +17,8 @@ SAMPLE_HOTELS = {
             "lat": 35.0262,
             "lon": 135.7721,
             "amenities": ["spa", "pool", "restaurant", "bar"],
-            "price_range": "luxury"
+            "price_range": "luxury",
+            "rooms": 40
         },
         {
             "id": "KYT002", 
@@ -21,7 +27,8 @@ SAMPLE_HOTELS = {
             "lat": 34.9858,
             "lon": 135.7588,
             "amenities": ["restaurant", "bar", "fitness-center"],
-            "price_range": "upscale"
+            "price_range": "upscale",
+            "rooms": 120
         },
         {
             "id": "KYT003",
@@ -30,17 +37,165 @@ SAMPLE_HOTELS = {
             "lat": 34.9875,
             "lon": 135.7593,
             "amenities": ["restaurant", "laundry"],
-            "price_range": "moderate"
+            "price_range": "moderate",
+            "rooms": 80
         }
     ]
 }
 
+# TravelRequest preferences that quote_hotels understands as filters
+HOTEL_PREFERENCES = ("min_rating", "amenities", "price_range", "max_price", "sort_by")
+
+_inventories = {}  # city -> HotelInventory
+_catalogs = {}  # city -> HotelCatalog, built on first quote
+_inventory_lock = threading.Lock()
+
+
+def register_hotels(location: str, hotels: List[Dict[str, Any]]) -> None:
+    """
+    Add or replace a city's hotels (e.g. thousands of properties).
+
+    Replacing a city's hotels also starts a fresh room inventory for it.
+
+    Args:
+        location: City name
+        hotels: Dicts with id, name, rating, lat, lon, amenities, price_range,
+            and optionally rooms and base_price
+    """
+    location = location.lower()
+    with _inventory_lock:
+        SAMPLE_HOTELS[location] = hotels
+        _inventories.pop(location, None)
+        _catalogs.pop(location, None)
+
+
+def get_inventory(location: str) -> HotelInventory:
+    """
+    Returns: The city's room inventory, created on first use
+    """
+    location = location.lower()
+    with _inventory_lock:
+        inventory = _inventories.get(location)
+        if inventory is None:
+            inventory = HotelInventory(SAMPLE_HOTELS[location])
+            _inventories[location] = inventory
+        return inventory
+
+
+def get_hotel_catalog(location: str) -> HotelCatalog:
+    """
+    Returns: The city's hotel arrays, built once per catalog
+    """
+    location = location.lower()
+    with _inventory_lock:
+        catalog = _catalogs.get(location)
+        if catalog is None:
+            catalog = HotelCatalog(SAMPLE_HOTELS[location])
+            _catalogs[location] = catalog
+        return catalog
+
+
+def _parse_stay(check_in: str, check_out: str) -> Tuple[date, date, int]:
+    """
+    Returns: (check-in date, check-out date, nights); raises ValueError on bad dates
+    """
+    try:
+        check_in_date = datetime.fromisoformat(check_in).date()
+        check_out_date = datetime.fromisoformat(check_out).date()
+        nights = (check_out_date - check_in_date).days
+
+        if nights <= 0:
+            raise ValueError("Check-out must be after check-in")
+
+    except ValueError as e:
+        raise ValueError(f"Invalid dates: {str(e)}")
+    return check_in_date, check_out_date, nights
+
+
+@traced("tool.quote_hotels")
+def quote_hotels(
+    location: str,
+    check_in: str,
+    check_out: str,
+    guests: int,
+    rooms: int = 1,
+    min_rating: Optional[float] = None,
+    amenities: Union[None, str, Iterable[str]] = None,
+    price_range: Union[None, str, Iterable[str]] = None,
+    max_price: Optional[float] = None,
+    sort_by: str = "price",
+    top_n: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Price a stay at every hotel in the city in one pass and rank the offers.
+
+    Args:
+        location: City name
+        check_in: Check-in date (ISO format)
+        check_out: Check-out date (ISO format)
+        guests: Number of guests
+        rooms: Rooms needed for every night of the stay
+        min_rating: Only hotels rated at least this
+        amenities: Amenity (or list of amenities) every offer must have
+        price_range: Price range (or list of them), e.g. "upscale"
+        max_price: Only offers whose total price is at most this
+        sort_by: "price" (cheapest first) or "rating" (best rated first)
+        top_n: Return at most this many offers
+
+    Returns:
+        Offers with hotel, nights, rooms, total_price, price_per_night and
+        rooms_left, best first. Hotels without enough free rooms are left out.
+    """
+    location = location.lower()
+    if location not in SAMPLE_HOTELS:
+        raise ValueError(f"No hotels found in {location}")
+    check_in_date, check_out_date, nights = _parse_stay(check_in, check_out)
+
+    catalog = get_hotel_catalog(location)
+    rooms_left = get_inventory(location).rooms_left_all(check_in_date, check_out_date)
+    mask = catalog.match(min_rating=min_rating, amenities=amenities, price_range=price_range)
+    mask &= rooms_left >= rooms
+
+    positions, totals = catalog.quote(nights, guests, rooms, mask=mask, max_price=max_price,
+                                      sort_by=sort_by, top_n=top_n)
+
+    return [
+        {
+            "hotel": catalog.hotels[position],
+            "check_in": check_in,
+            "check_out": check_out,
+            "guests": guests,
+            "nights": nights,
+            "rooms": rooms,
+            "total_price": round(total, 2),
+            "price_per_night": round(total / nights, 2),
+            "currency": "USD",
+            "rooms_left": left
+        }
+        for position, total, left in zip(
+            positions.tolist(), totals.tolist(), rooms_left[positions].tolist()
+        )
+    ]
+
+
+def cancel_booking(location: str, booking_id: str) -> bool:
+    """
+    Cancel a booking made by book_hotel and return its room to the inventory.
+
+    Returns: False if the booking was unknown or already cancelled
+    """
+    return get_inventory(location).release(booking_id)
+
+
+@traced("tool.book_hotel")
 def book_hotel(
     location: str,
     check_in: str,
     check_out: str,
     guests: int,
-    hotel_id: Optional[str] = None
+    hotel_id: Optional[str] = None,
+    rooms: int = 1,
+    rng: Optional[random.Random] = None
 ) -> Dict[str, Any]:
     """
     Simulated hotel booking using Amadeus-like API.
@@ -51,25 +206,22 @@ def book_hotel(
         check_out: Check-out date (ISO format)
         guests: Number of guests
         hotel_id: Optional specific hotel ID to book
+        rooms: Rooms to book for every night of the stay
+        rng: Random source for the simulated choices; the random module by default
     
     Returns:
         Booking confirmation with details
+
+    Raises:
+        ValueError: Bad dates, unknown hotel, or no rooms left (SoldOutError)
     """
     location = location.lower()
     if location not in SAMPLE_HOTELS:
         raise ValueError(f"No hotels found in {location}")
+    rng = rng or random
         
     # Parse dates
-    try:
-        check_in_date = datetime.fromisoformat(check_in)
-        check_out_date = datetime.fromisoformat(check_out)
-        nights = (check_out_date - check_in_date).days
-        
-        if nights <= 0:
-            raise ValueError("Check-out must be after check-in")
-            
-    except ValueError as e:
-        raise ValueError(f"Invalid dates: {str(e)}")
+    check_in_date, check_out_date, nights = _parse_stay(check_in, check_out)
         
     # Find available hotel
     hotels = SAMPLE_HOTELS[location]
@@ -77,21 +229,25 @@ def book_hotel(
         hotel = next((h for h in hotels if h["id"] == hotel_id), None)
         if not hotel:
             raise ValueError(f"Hotel {hotel_id} not found")
+        candidates = [hotel]
     else:
-        # Randomly select a hotel
-        hotel = random.choice(hotels)
-        
-    # Generate booking
-    booking_id = f"BK{random.randint(10000, 99999)}"
-    
-    # Calculate simulated price
-    base_price = {
-        "luxury": 500,
-        "upscale": 250,
-        "moderate": 150
-    }.get(hotel["price_range"], 200)
+        # Try hotels in random order until one has rooms for every night
+        candidates = rng.sample(hotels, len(hotels))
+
+    # Reserve and confirm atomically against the shared inventory
+    inventory = get_inventory(location)
+    for hotel in candidates:
+        try:
+            booking_id = inventory.reserve(hotel["id"], check_in_date, check_out_date, rooms)
+            break
+        except SoldOutError:
+            continue
+    else:
+        raise SoldOutError(f"No rooms available in {location} from {check_in} to {check_out}")
+    inventory.commit(booking_id)
     
-    total_price = base_price * nights * (1 + (guests-1)*0.5)  # 50% extra per additional guest
+    # Calculate simulated price (50% extra per additional guest)
+    total_price = stay_price(base_price(hotel), nights, guests, rooms)
     
     return {
         "booking_id": booking_id,
@@ -100,9 +256,10 @@ def book_hotel(
         "check_out": check_out,
         "guests": guests,
         "nights": nights,
+        "rooms": rooms,
         "total_price": round(total_price, 2),
         "currency": "USD",
         "status": "confirmed",
-        "confirmation_code": f"HTL{random.randint(100000, 999999)}",
+        "confirmation_code": f"HTL{rng.randint(100000, 999999)}",
         "cancellation_policy": "Free cancellation until 24 hours before check-in"
     }
\ No newline at end of file
@@ -0,0 +1,147 @@
+import asyncio
+import atexit
+import os
+import threading
+import weakref
+
+import httpx
+
+from record_replay import wrap_transport
+
+
+# Connection pool settings shared by every network tool
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+HTTP2 = os.getenv("HTTP2", "false").lower() == "true"
+
+_lock = threading.Lock()
+_client = None
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncClient
+_loop = None
+_loop_thread = None
+
+
+def _client_options(is_async=False):
+    """
+    Keyword arguments for the sync or async client.
+
+    The pooled transport is built explicitly so record_replay can wrap it
+    (RECORD_MODE=record/replay); otherwise it is passed through unchanged.
+    """
+    http2 = HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
+
+    transport_cls = httpx.AsyncHTTPTransport if is_async else httpx.HTTPTransport
+    transport = transport_cls(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+    return {
+        "timeout": HTTP_TIMEOUT,
+        "transport": wrap_transport(transport, is_async=is_async)
+    }
+
+
+def get_client() -> httpx.Client:
+    """
+    Returns the process-wide pooled sync client, creating it on first use.
+    """
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_options())
+        return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled async client for the running event loop.
+
+    Async connections are bound to the loop that opened them, so each loop
+    gets its own client. Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_options(is_async=True))
+            _async_clients[loop] = client
+        return client
+
+
+def _background_loop():
+    """
+    Returns a long-lived event loop running in a daemon thread.
+    """
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="tools-http-loop", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from sync code.
+
+    Coroutines run on one shared background loop rather than a fresh
+    asyncio.run() loop per call, so the async client and its keep-alive
+    connections survive between calls. Safe to call from inside another
+    event loop (the calling thread blocks until the result is ready).
+    """
+    loop = _background_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def aclose_async_client():
+    """
+    Close the pooled async client of the running event loop, if any.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_clients():
+    """
+    Close pooled clients and stop the background loop. Runs at interpreter exit.
+    """
+    global _client, _loop, _loop_thread
+
+    with _lock:
+        client, _client = _client, None
+        loop, _loop = _loop, None
+        thread, _loop_thread = _loop_thread, None
+
+    if client is not None:
+        client.close()
+
+    if loop is not None and not loop.is_closed():
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_async_client(), loop).result(timeout=5)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+atexit.register(close_clients)
@@ -0,0 +1,239 @@
+"""
+Hotel room inventory with per-night availability and race-free booking.
+
+Each city's inventory keeps a (hotels x nights) int32 array of rooms left. A
+stay is a contiguous slice of one hotel's row, so checking or changing it
+costs O(nights).
+
+Booking is two-phase:
+
+    hold_id = inventory.reserve("KYT001", check_in, check_out)   # rooms taken, held
+    inventory.commit(hold_id)                                    # hold becomes a booking
+    inventory.release(hold_id)                                   # rooms returned (hold or booking)
+
+Stays must start on or after the inventory's first night and end within
+HOTEL_BOOKING_HORIZON days of today. Queries never grow the arrays: nights
+past the allocated columns have nothing booked, so they count as full
+capacity. Only reserve() extends the arrays, and never past the horizon.
+
+Holds that are not committed within HOTEL_HOLD_TTL seconds expire and their
+rooms are returned. Every operation runs under the inventory's lock and never
+awaits while holding it. That keeps it correct from many threads and from many
+asyncio tasks, which can call it directly since each call takes microseconds.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+
+HOTEL_HOLD_TTL = float(os.getenv("HOTEL_HOLD_TTL", "900"))  # seconds
+HOTEL_BOOKING_HORIZON = int(os.getenv("HOTEL_BOOKING_HORIZON", "730"))  # days ahead a stay may end
+DEFAULT_ROOMS = 100  # for hotels without a "rooms" count
+HORIZON_DAYS = 365  # nights allocated up front; reserve() grows the arrays on demand
+
+
+class SoldOutError(ValueError):
+    """Raised when a hotel has too few rooms left on some night of the stay."""
+
+
+class Hold(NamedTuple):
+    hotel: int
+    start: int  # first night, as a column of the rooms array
+    end: int  # night after the last one
+    rooms: int
+    expires: Optional[float]  # None once committed
+
+
+class HotelInventory:
+    """
+    Rooms left per hotel and night for one city.
+
+    Args:
+        hotels: Hotel dicts with "id" and optionally "rooms" (total rooms)
+        start: First bookable night; earlier stays are rejected
+        hold_ttl: Seconds an uncommitted hold keeps its rooms
+        horizon_days: Stays must end within this many days of today
+    """
+
+    def __init__(self, hotels: List[Dict[str, Any]], start: Optional[date] = None,
+                 hold_ttl: float = HOTEL_HOLD_TTL, horizon_days: int = HOTEL_BOOKING_HORIZON):
+        self.hotel_ids = [hotel["id"] for hotel in hotels]
+        self._index = {hotel_id: i for i, hotel_id in enumerate(self.hotel_ids)}
+        self.capacity = np.array([hotel.get("rooms", DEFAULT_ROOMS) for hotel in hotels], dtype=np.int32)
+        self.hold_ttl = hold_ttl
+        self.horizon_days = horizon_days
+
+        self._base = (start or date.today()).toordinal()
+        self._rooms = np.repeat(self.capacity[:, None], HORIZON_DAYS, axis=1)
+
+        self._lock = threading.Lock()
+        self._holds = {}  # hold_id -> Hold
+        self._expiry = []  # heap of (expires, hold_id)
+        self._ids = itertools.count(1)
+
+    # --- helpers (caller holds the lock) ----------------------------------------
+
+    def _columns(self, check_in: date, check_out: date):
+        """
+        Column range for the stay's nights; may run past the allocated arrays.
+
+        Raises: ValueError if the stay is empty or outside the booking horizon
+        """
+        if check_out <= check_in:
+            raise ValueError("Check-out must be after check-in")
+        if check_in.toordinal() < self._base:
+            raise ValueError(f"Check-in {check_in} is before {date.fromordinal(self._base)}")
+        last = date.today().toordinal() + self.horizon_days
+        if check_out.toordinal() > last:
+            raise ValueError(f"Check-out {check_out} is after {date.fromordinal(last)}, "
+                             f"more than {self.horizon_days} days ahead")
+        start = check_in.toordinal() - self._base
+        return start, start + (check_out - check_in).days
+
+    def _allocate(self, end):
+        """
+        Grow the arrays to at least `end` columns.
+        """
+        width = self._rooms.shape[1]
+        if end > width:
+            grow = max(end - width, HORIZON_DAYS)
+            self._rooms = np.concatenate(
+                (self._rooms, np.repeat(self.capacity[:, None], grow, axis=1)), axis=1
+            )
+
+    def _hotel(self, hotel_id):
+        try:
+            return self._index[hotel_id]
+        except KeyError:
+            raise ValueError(f"Hotel {hotel_id} not found")
+
+    def _expire(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            # Skip holds already committed or released
+            if hold is not None and hold.expires is not None and hold.expires <= now:
+                self._rooms[hold.hotel, hold.start:hold.end] += hold.rooms
+                del self._holds[hold_id]
+
+    # --- queries ------------------------------------------------------------------
+
+    def rooms_left(self, hotel_id: str, check_in: date, check_out: date) -> int:
+        """
+        Returns: Rooms free on every night of the stay
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            hotel = self._hotel(hotel_id)
+            start, end = self._columns(check_in, check_out)
+            if start >= self._rooms.shape[1]:
+                return int(self.capacity[hotel])
+            # Unallocated nights are at full capacity, so only the allocated ones can be lower
+            return int(self._rooms[hotel, start:end].min())
+
+    def available(self, hotel_id: str, check_in: date, check_out: date, rooms: int = 1) -> bool:
+        return self.rooms_left(hotel_id, check_in, check_out) >= rooms
+
+    def rooms_left_all(self, check_in: date, check_out: date) -> np.ndarray:
+        """
+        Returns: Rooms free for the whole stay at every hotel, in hotel_ids order
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            start, end = self._columns(check_in, check_out)
+            if start >= self._rooms.shape[1]:
+                return self.capacity.copy()
+            return self._rooms[:, start:end].min(axis=1)
+
+    def availability(self, check_in: date, check_out: date) -> Dict[str, int]:
+        """
+        Returns: Rooms free for the whole stay at every hotel in the city
+        """
+        return dict(zip(self.hotel_ids, self.rooms_left_all(check_in, check_out).tolist()))
+
+    # --- booking ------------------------------------------------------------------
+
+    def reserve(self, hotel_id: str, check_in: date, check_out: date, rooms: int = 1) -> str:
+        """
+        Take `rooms` rooms on every night of the stay, or none at all.
+
+        Returns: hold_id for commit() / release()
+        Raises: SoldOutError if any night has fewer than `rooms` left,
+            ValueError if the stay is outside the booking horizon
+        """
+        if rooms <= 0:
+            raise ValueError("rooms must be positive")
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            hotel = self._hotel(hotel_id)
+            start, end = self._columns(check_in, check_out)
+            self._allocate(end)
+
+            nights = self._rooms[hotel, start:end]
+            if nights.min() < rooms:
+                raise SoldOutError(f"{hotel_id} has no {rooms} room(s) free from {check_in} to {check_out}")
+            nights -= rooms
+
+            hold_id = f"BK{next(self._ids):06d}"
+            expires = now + self.hold_ttl
+            self._holds[hold_id] = Hold(hotel, start, end, rooms, expires)
+            heapq.heappush(self._expiry, (expires, hold_id))
+            return hold_id
+
+    def commit(self, hold_id: str) -> None:
+        """
+        Turn a hold into a booking that no longer expires.
+
+        Raises: KeyError if the hold is unknown, released or expired
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            hold = self._holds.get(hold_id)
+            if hold is None:
+                raise KeyError(f"Hold {hold_id} is unknown or expired")
+            self._holds[hold_id] = hold._replace(expires=None)
+
+    def release(self, hold_id: str) -> bool:
+        """
+        Return a hold's or booking's rooms to the inventory.
+
+        Returns: False if the hold was already released or expired
+        """
+        with self._lock:
+            hold = self._holds.pop(hold_id, None)
+            if hold is None:
+                return False
+            self._rooms[hold.hotel, hold.start:hold.end] += hold.rooms
+            return True
+
+    def _taken(self):
+        taken = np.zeros_like(self._rooms)
+        for hold in self._holds.values():
+            taken[hold.hotel, hold.start:hold.end] += hold.rooms
+        return taken
+
+    def booked_rooms(self) -> np.ndarray:
+        """
+        Returns: (hotels x nights) rooms taken by holds and bookings, from the hold records
+        """
+        with self._lock:
+            return self._taken()
+
+    def check(self) -> None:
+        """
+        Assert that no night is overbooked and the arrays match the hold records.
+        """
+        with self._lock:
+            taken = self._taken()
+            assert (self._rooms >= 0).all(), "negative rooms left"
+            assert (taken <= self.capacity[:, None]).all(), "overbooked"
+            assert (self._rooms + taken == self.capacity[:, None]).all(), "rooms left disagree with holds"
@@ -0,0 +1,177 @@
+"""
+Turn researched attractions into per-day routes from the hotel.
+
+1. One distance matrix (hotel + attractions) is computed up front.
+2. Attractions are placed on days best-rated first. Each goes to the day
+   where it adds the least: the extra travel of inserting it into that day's
+   route plus a penalty for the crowd level forecast on that day. Days are
+   capped at ITINERARY_DAY_HOURS of visiting plus travel, and attractions
+   that fit nowhere are returned as unscheduled.
+3. Each day's stops are reordered into a short round trip from the hotel
+   with tools.routing.solve_route (exact for small days, 2-opt for big ones).
+"""
+
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools.crowds import BEST_TIMES, CROWD_LEVELS, CrowdForecast
+from tools.routing import distance_matrix, route_length, solve_route
+
+
+ITINERARY_DAY_HOURS = float(os.getenv("ITINERARY_DAY_HOURS", "8"))  # visiting + travel per day
+ITINERARY_SPEED_KMH = float(os.getenv("ITINERARY_SPEED_KMH", "15"))  # average city travel speed
+DAY_START_HOUR = 9.0
+# Extra cost, in hours, of visiting on a low / medium / high crowd day
+CROWD_PENALTY_HOURS = np.array([0.0, 0.5, 1.5])
+
+
+def _crowd_levels(attraction: Dict[str, Any], start: date, days: int) -> np.ndarray:
+    """
+    Returns: Index into CROWD_LEVELS for each trip day (-1 where unknown)
+    """
+    levels = np.full(days, -1, dtype=np.int8)
+    forecast = attraction.get("crowd_forecast")
+    if isinstance(forecast, CrowdForecast):
+        offset = (start - forecast.start).days
+        lo, hi = max(0, -offset), min(days, forecast.days - offset)
+        if lo < hi:
+            levels[lo:hi] = forecast.levels[lo + offset:hi + offset]
+    elif forecast:
+        # Plain list of per-day dicts
+        by_date = {day["date"]: CROWD_LEVELS.index(day["crowd_level"]) for day in forecast}
+        for i in range(days):
+            levels[i] = by_date.get((start + timedelta(days=i)).isoformat(), -1)
+    return levels
+
+
+def _best_time(attraction: Dict[str, Any], day: date) -> Optional[str]:
+    forecast = attraction.get("crowd_forecast")
+    if isinstance(forecast, CrowdForecast):
+        offset = forecast.index_of(day)
+        return None if offset is None else BEST_TIMES[forecast.best_times[offset]]
+    for entry in forecast or ():
+        if entry["date"] == day.isoformat():
+            return entry["best_time"]
+    return None
+
+
+def _clock(hours: float) -> str:
+    minutes = int(round(hours * 60))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def plan_itinerary(attractions: List[Dict[str, Any]], start: date, end: date,
+                   hotel: Optional[Tuple[float, float]] = None,
+                   day_hours: float = ITINERARY_DAY_HOURS,
+                   speed_kmh: float = ITINERARY_SPEED_KMH) -> Dict[str, Any]:
+    """
+    Plan ordered sightseeing routes for each day from start to end (inclusive).
+
+    Args:
+        attractions: Dicts with name, lat, lon, visit_duration (hours), and
+            optionally rating and crowd_forecast
+        start: First day of the trip
+        end: Last day of the trip
+        hotel: (lat, lon) every day starts and ends at; defaults to the
+            attractions' mean position
+        day_hours: Visiting plus travel time available per day
+        speed_kmh: Average travel speed between stops
+
+    Returns:
+        {"days": [{"date", "stops", "travel_km", "hours"}], "unscheduled": [names]}.
+        Each stop has name, arrive, leave, travel_km (from the previous stop),
+        crowd_level and best_time.
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        raise ValueError("end must not be before start")
+    if not attractions:
+        return {"days": [], "unscheduled": []}
+
+    lats = np.array([poi["lat"] for poi in attractions], dtype=np.float64)
+    lons = np.array([poi["lon"] for poi in attractions], dtype=np.float64)
+    if hotel is None:
+        hotel = (float(lats.mean()), float(lons.mean()))
+
+    # Node 0 is the hotel, node i + 1 is attractions[i]
+    dist = distance_matrix(np.concatenate(([hotel[0]], lats)), np.concatenate(([hotel[1]], lons)))
+    travel = dist / speed_kmh
+    visit = np.array([float(poi.get("visit_duration", 1)) for poi in attractions])
+    crowds = np.stack([_crowd_levels(poi, start, days) for poi in attractions])
+    penalty = np.where(crowds >= 0, CROWD_PENALTY_HOURS[np.maximum(crowds, 0)], 0.0)
+
+    # Best-rated first, shorter visits first on ties
+    order = sorted(range(len(attractions)), key=lambda i: (-attractions[i].get("rating", 0), visit[i]))
+
+    tours = [[0, 0] for _ in range(days)]  # closed tours through the hotel
+    used = np.zeros(days)  # visiting + travel hours per day
+    unscheduled = []
+    for i in order:
+        node = i + 1
+        best = None
+        for day in range(days):
+            tour = np.asarray(tours[day])
+            a, b = tour[:-1], tour[1:]
+            extra = travel[a, node] + travel[node, b] - travel[a, b]
+            position = int(extra.argmin())
+            added = visit[i] + extra[position]
+            if used[day] + added > day_hours:
+                continue
+            score = extra[position] + penalty[i, day]
+            if best is None or score < best[0]:
+                best = (score, day, position, added)
+        if best is None:
+            unscheduled.append(attractions[i]["name"])
+            continue
+        _, day, position, added = best
+        tours[day].insert(position + 1, node)
+        used[day] += added
+
+    plan = []
+    for day in range(days):
+        nodes = tours[day][1:-1]
+        day_date = start + timedelta(days=day)
+        if not nodes:
+            plan.append({"date": day_date.isoformat(), "stops": [], "travel_km": 0.0, "hours": 0.0})
+            continue
+
+        index = np.array([0] + nodes)
+        sub = dist[np.ix_(index, index)]
+        solved = solve_route(sub)
+        # The heuristic can lose to the insertion order on big days; keep the shorter
+        inserted = list(range(1, len(index)))
+        if route_length(sub, inserted) < route_length(sub, solved):
+            solved = inserted
+        route = [int(index[k]) for k in solved]
+
+        stops, clock, previous, km = [], DAY_START_HOUR, 0, 0.0
+        for node in route:
+            poi = attractions[node - 1]
+            km += dist[previous, node]
+            clock += travel[previous, node]
+            arrive = clock
+            clock += visit[node - 1]
+            level = crowds[node - 1, day]
+            stops.append({
+                "name": poi["name"],
+                "arrive": _clock(arrive),
+                "leave": _clock(clock),
+                "travel_km": round(float(dist[previous, node]), 2),
+                "crowd_level": CROWD_LEVELS[level] if level >= 0 else None,
+                "best_time": _best_time(poi, day_date)
+            })
+            previous = node
+        km += dist[previous, 0]
+        clock += travel[previous, 0]
+
+        plan.append({
+            "date": day_date.isoformat(),
+            "stops": stops,
+            "travel_km": round(float(km), 2),
+            "hours": round(float(clock - DAY_START_HOUR), 2)
+        })
+
+    return {"days": plan, "unscheduled": unscheduled}
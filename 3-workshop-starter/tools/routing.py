@@ -0,0 +1,141 @@
+"""
+Round-trip route solvers over a precomputed distance matrix.
+
+Node 0 is the start (the hotel). A route visits every other node once and
+returns to node 0. Up to HELD_KARP_MAX_STOPS stops are solved exactly with
+Held-Karp dynamic programming, vectorized over all subsets of one size at a
+time. Larger sets start from a nearest-neighbour tour and are improved with
+2-opt until no segment reversal shortens the route.
+"""
+
+import os
+from typing import List, Sequence
+
+import numpy as np
+
+from tools.spatial import haversine_km
+
+
+# Largest number of stops solved exactly (the DP table has 2^n x n cells)
+HELD_KARP_MAX_STOPS = int(os.getenv("HELD_KARP_MAX_STOPS", "12"))
+TWO_OPT_MAX_SWEEPS = 100
+
+
+def distance_matrix(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Returns: (n x n) great-circle distances in km between all points
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+def route_length(dist: np.ndarray, route: Sequence[int]) -> float:
+    """
+    Returns: Length of the closed route starting and ending at node 0
+    """
+    tour = np.concatenate(([0], route, [0])).astype(np.int64)
+    return float(dist[tour[:-1], tour[1:]].sum())
+
+
+def held_karp(dist: np.ndarray) -> List[int]:
+    """
+    Shortest round trip from node 0 through every other node (exact).
+
+    Returns: Visiting order of nodes 1..n-1
+    """
+    n = len(dist) - 1
+    if n <= 1:
+        return list(range(1, n + 1))
+
+    full = (1 << n) - 1
+    cost = np.full((1 << n, n), np.inf)
+    parent = np.full((1 << n, n), -1, dtype=np.int64)
+    stops = dist[1:, 1:]
+    for j in range(n):
+        cost[1 << j, j] = dist[0, j + 1]
+
+    # All masks grouped by subset size, so every layer only reads the previous one
+    masks = np.arange(1 << n)
+    sizes = np.zeros(1 << n, dtype=np.int64)
+    for j in range(n):
+        sizes += (masks >> j) & 1
+
+    for size in range(2, n + 1):
+        layer = masks[sizes == size]
+        for j in range(n):
+            ends = layer[(layer >> j) & 1 == 1]
+            prev = ends ^ (1 << j)
+            # cost of reaching j last = best over the previous last stop k
+            candidates = cost[prev] + stops[:, j]
+            best = candidates.argmin(axis=1)
+            cost[ends, j] = candidates[np.arange(len(ends)), best]
+            parent[ends, j] = best
+
+    last = int((cost[full] + dist[1:, 0]).argmin())
+    route, mask = [], full
+    while last >= 0:
+        route.append(last + 1)
+        mask, last = mask ^ (1 << last), int(parent[mask, last])
+    return route[::-1]
+
+
+def nearest_neighbor(dist: np.ndarray) -> List[int]:
+    """
+    Greedy tour: from node 0, always go to the closest unvisited node.
+
+    Returns: Visiting order of nodes 1..n-1
+    """
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    route, current = [], 0
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[current])
+        current = int(row.argmin())
+        visited[current] = True
+        route.append(current)
+    return route
+
+
+def two_opt(dist: np.ndarray, route: Sequence[int], max_sweeps: int = TWO_OPT_MAX_SWEEPS) -> List[int]:
+    """
+    Improve a round trip by reversing segments while that makes it shorter.
+
+    Each step checks every segment starting at one position in a single
+    vectorized pass and applies the best reversal found.
+
+    Returns: The improved visiting order of nodes 1..n-1
+    """
+    tour = np.concatenate(([0], route, [0])).astype(np.int64)
+    m = len(tour)
+    if m < 5:
+        return list(route)
+
+    for _ in range(max_sweeps):
+        improved = False
+        for i in range(1, m - 2):
+            # Reverse tour[i..k]: edges (a,b) and (c,e) become (a,c) and (b,e)
+            a, b = tour[i - 1], tour[i]
+            c, e = tour[i + 1:m - 1], tour[i + 2:m]
+            delta = dist[a, c] + dist[b, e] - dist[a, b] - dist[c, e]
+            k = int(delta.argmin())
+            if delta[k] < -1e-9:
+                k += i + 1
+                tour[i:k + 1] = tour[i:k + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return tour[1:-1].tolist()
+
+
+def solve_route(dist: np.ndarray) -> List[int]:
+    """
+    Short round trip from node 0 through every other node: exact for up to
+    HELD_KARP_MAX_STOPS stops, nearest neighbour + 2-opt beyond that.
+
+    Returns: Visiting order of nodes 1..n-1
+    """
+    if len(dist) - 1 <= HELD_KARP_MAX_STOPS:
+        return held_karp(dist)
+    return two_opt(dist, nearest_neighbor(dist))
@@ -1,62 +1,217 @@
+import html
+import os
+import re
+import threading
+
 import httpx
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
 
+from .http_client import get_client
 
-def singapore_news() -> str:
+
+FEED_URL = "https://mothership.sg/feed/"
+NEWS_LIMIT = 10
+
+# "stream": incremental lxml parse that stops after NEWS_LIMIT items (default)
+# "soup": full BeautifulSoup parse of the whole feed
+NEWS_PARSER = os.getenv("NEWS_PARSER", "stream").lower()
+
+TAG_RE = re.compile(r"<[^>]*>")
+
+# Feed URL -> {"etag", "last_modified", "limit", "items"}. Lets repeated calls
+# revalidate with a conditional GET and skip the download and parse on a 304.
+_FEED_CACHE = {}
+_FEED_CACHE_LOCK = threading.Lock()
+
+
+def parse_feed(text, limit=NEWS_LIMIT):
     """
-    Returns the latest Singapore news from Mothership.sg RSS feed.
-    Fetches article titles and descriptions from the RSS feed.
+    Parse an RSS document into a list of news items.
+
+    Args:
+        text: RSS XML as a string
+        limit: Maximum number of items to parse
+
+    Returns: List of {"title", "snippet"} dicts
     """
+    soup = BeautifulSoup(text, "xml")
 
-    result = "Latest Singapore news:\n\n"
+    items = soup.find_all("item", limit=limit)
+
+    news_items = []
+    for item in items:
+        try:
+            # Ensure item is a Tag
+            if not isinstance(item, Tag):
+                continue
+
+            # Extract title
+            title_elem = item.find("title")
+            title = title_elem.text.strip() if title_elem else ""
+
+            # Extract description/snippet
+            desc_elem = item.find("description")
+            snippet = desc_elem.text.strip() if desc_elem else ""
+
+            # Clean snippet - remove HTML if any
+            if snippet:
+                # Parse snippet to remove any HTML tags
+                snippet_soup = BeautifulSoup(snippet, "html.parser")
+                snippet = snippet_soup.get_text().strip()
+
+            if title:
+                news_items.append({
+                    "title": title,
+                    "snippet": snippet
+                })
+
+        except Exception:
+            continue  # Skip problematic items
+
+    return news_items
+
+
+def strip_html(text):
+    """
+    Lightweight HTML-to-text: drop tags and decode entities.
+    """
+    return html.unescape(TAG_RE.sub("", text)).strip()
+
+
+def parse_feed_stream(chunks, limit=NEWS_LIMIT):
+    """
+    Incrementally parse an RSS byte stream, stopping after `limit` items.
+
+    Only the current <item> element is kept in memory, and the rest of the
+    stream is never read once enough items have been parsed. Like the soup
+    parser, it recovers from malformed markup (e.g. a bare "&" in a title)
+    instead of dropping everything after it.
+
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_bytes())
+        limit: Maximum number of items to parse
+
+    Returns: List of {"title", "snippet"} dicts
+    """
+    parser = etree.XMLPullParser(events=("end",), tag="item", resolve_entities=False, recover=True)
+    news_items = []
+
+    def read_items():
+        for _, item in parser.read_events():
+            title = (item.findtext("title") or "").strip()
+            snippet = strip_html(item.findtext("description") or "")
+
+            if title:
+                news_items.append({
+                    "title": title,
+                    "snippet": snippet
+                })
 
+            # Free the parsed item and anything before it
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+
+            if len(news_items) >= limit:
+                return True
+        return False
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        if read_items():
+            return news_items
+
+    # End of input: flush items the parser was still holding back
     try:
-        # Add timeout back and debug
-        response = httpx.get("https://mothership.sg/feed/", timeout=2.0)
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass
+    read_items()
+    return news_items
+
+
+def fetch_news_items(url=FEED_URL, limit=NEWS_LIMIT):
+    """
+    Fetch and parse a feed, revalidating any cached copy with a conditional GET.
+
+    Sends If-None-Match / If-Modified-Since from the previous response. A 304
+    returns the cached items without downloading or parsing the feed again.
+
+    Args:
+        url: RSS feed URL
+        limit: Maximum number of items to return
+
+    Returns: List of {"title", "snippet"} dicts
+    """
+    with _FEED_CACHE_LOCK:
+        cached = _FEED_CACHE.get(url)
+
+    # A cached parse with fewer items than requested cannot answer this call
+    if cached and cached["limit"] < limit:
+        cached = None
+
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    with get_client().stream("GET", url, timeout=2.0, headers=headers) as response:
+        if response.status_code == 304 and cached:
+            return cached["items"][:limit]
+
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "xml")
-
-        items = soup.find_all("item", limit=10)
-
-        if items:
-            news_items = []
-            for item in items:
-                try:
-                    # Ensure item is a Tag
-                    if not isinstance(item, Tag):
-                        continue
-
-                    # Extract title
-                    title_elem = item.find("title")
-                    title = title_elem.text.strip() if title_elem else ""
-
-                    # Extract description/snippet
-                    desc_elem = item.find("description")
-                    snippet = desc_elem.text.strip() if desc_elem else ""
-
-                    # Clean snippet - remove HTML if any
-                    if snippet:
-                        # Parse snippet to remove any HTML tags
-                        snippet_soup = BeautifulSoup(snippet, "html.parser")
-                        snippet = snippet_soup.get_text().strip()
-
-                    if title:
-                        news_items.append({
-                            "title": title,
-                            "snippet": snippet
-                        })
-
-                except Exception:
-                    continue  # Skip problematic items
-
-            if news_items:
-                for i, item in enumerate(news_items, 1):
-                    result += f"{i}. {item['title']}\n"
-                    if item['snippet']:
-                        result += f"   {item['snippet']}\n"
-                    result += "\n"
-                return result.strip()
+        if NEWS_PARSER == "soup":
+            response.read()
+            items = parse_feed(response.text, limit)
+        else:
+            body = response.iter_bytes()
+            items = parse_feed_stream(body, limit)
+            # Read the unparsed rest of the body so the connection goes back
+            # to the pool; closing it would cost a new TLS handshake next time
+            for _ in body:
+                pass
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if items and (etag or last_modified):
+        with _FEED_CACHE_LOCK:
+            _FEED_CACHE[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "limit": limit,
+                "items": items
+            }
+
+    return items
+
+
+def format_news(news_items):
+    """
+    Format news items into the text returned to agents.
+    """
+    result = "Latest Singapore news:\n\n"
+    for i, item in enumerate(news_items, 1):
+        result += f"{i}. {item['title']}\n"
+        if item['snippet']:
+            result += f"   {item['snippet']}\n"
+        result += "\n"
+    return result.strip()
+
+
+def singapore_news() -> str:
+    """
+    Returns the latest Singapore news from Mothership.sg RSS feed.
+    Fetches article titles and descriptions from the RSS feed.
+    """
+
+    try:
+        news_items = fetch_news_items()
+        if news_items:
+            return format_news(news_items)
 
     except httpx.TimeoutException:
         pass
@@ -66,6 +221,7 @@ def singapore_news() -> str:
         pass
 
     # Fallback news if RSS fetch fails
+    result = "Latest Singapore news:\n\n"
     result += "1. Local kopitiam wins best kopi award\n"
     result += "   Traditional coffee-making skills recognized nationally\n\n"
     result += "2. New MRT line to connect heartlands\n"
@@ -1,4 +1,8 @@
-import httpx
+import asyncio
+import os
+
+from .cache import TTLCache
+from .http_client import get_async_client, run_sync
 
 
 PRIMARY_STATION = "S111"  # Scotts Road
@@ -11,6 +15,35 @@ API_ENDPOINTS = {
     "wind_speed": "https://api-open.data.gov.sg/v2/real-time/api/wind-speed"
 }
 
+METRIC_UNITS = {
+    "temperature": "°C",
+    "humidity": "%",
+    "rainfall": " mm",
+    "wind_speed": " km/h"
+}
+
+REQUEST_TIMEOUT = 10.0  # Per-request timeout (seconds)
+DEFAULT_DEADLINE = 10.0  # Overall budget for all four requests (seconds)
+
+# NEA readings only change every few minutes, so share them across all agents
+# in the process. Stale readings are served while a background refresh runs.
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "300"))
+WEATHER_CACHE_MAX_STALE = float(os.getenv("WEATHER_CACHE_MAX_STALE", "3600"))
+
+WEATHER_CACHE = TTLCache(ttl=WEATHER_CACHE_TTL, max_stale=WEATHER_CACHE_MAX_STALE)
+
+
+class PartialReadingsError(RuntimeError):
+    """
+    Some metrics missed the deadline. Carries the readings that did arrive,
+    which are returned to the caller but never cached.
+    """
+
+    def __init__(self, weather_data):
+        missing = [metric for metric in API_ENDPOINTS if weather_data.get(metric, "N/A") == "N/A"]
+        super().__init__(f"No NEA readings for: {', '.join(missing)}")
+        self.weather_data = weather_data
+
 
 def extract_station_data(response_data, stations):
     """
@@ -43,43 +76,138 @@ def extract_station_data(response_data, stations):
     return None
 
 
-def singapore_weather() -> str:
+def format_weather(weather_data):
     """
-    Returns Singapore weather information using NEA's API. For reference we are using weather station: S111: Scotts Road, failing which, we use S50: Clementi.
-    1. Temperature: https://api-open.data.gov.sg/v2/real-time/api/air-temperature
-    2. Relative humidity: https://api-open.data.gov.sg/v2/real-time/api/relative-humidity
-    3. Rainfall: https://api-open.data.gov.sg/v2/real-time/api/rainfall
-    4. Wind: https://api-open.data.gov.sg/v2/real-time/api/wind-speed
+    Format collected readings into the text returned to agents.
+
+    Args:
+        weather_data: Dict of metric -> formatted reading
+
+    Returns: Weather report string, with N/A for any missing metric
+    """
+    result = f"Weather in Singapore now:\n"
+    result += f"Temperature: {weather_data.get('temperature', 'N/A')}\n"
+    result += f"Humidity: {weather_data.get('humidity', 'N/A')}\n"
+    result += f"Rainfall: {weather_data.get('rainfall', 'N/A')}\n"
+    result += f"Wind Speed: {weather_data.get('wind_speed', 'N/A')}"
+
+    return result
+
+
+async def fetch_metric(client, metric, url, stations):
+    """
+    Fetch a single NEA endpoint and return (metric, formatted value or "N/A").
+    """
+    try:
+        response = await client.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+
+        value = extract_station_data(data, stations)
+
+        if value is not None:
+            return metric, f"{value}{METRIC_UNITS[metric]}"
+
+    except Exception as e:
+        pass
+
+    return metric, "N/A"
+
+
+async def fetch_weather_data(deadline=DEFAULT_DEADLINE):
+    """
+    Fire all four NEA requests at once and collect whatever arrives in time.
+
+    Args:
+        deadline: Overall time budget in seconds shared by all requests. Metrics
+            that have not arrived by then are reported as N/A.
+
+    Returns: Dict of metric -> formatted reading (or "N/A")
     """
 
     weather_data = {}
     stations = [PRIMARY_STATION, FALLBACK_STATION]
 
-    with httpx.Client(timeout=10.0) as client:
-        for metric, url in API_ENDPOINTS.items():
-            try:
-                response = client.get(url)
-                response.raise_for_status()
-                data = response.json()
+    client = get_async_client()
+    pending = [
+        asyncio.create_task(fetch_metric(client, metric, url, stations))
+        for metric, url in API_ENDPOINTS.items()
+    ]
 
-                value = extract_station_data(data, stations)
+    done, not_done = await asyncio.wait(pending, timeout=deadline)
 
-                if metric == "temperature" and value is not None:
-                    weather_data["temperature"] = f"{value}°C"
-                elif metric == "humidity" and value is not None:
-                    weather_data["humidity"] = f"{value}%"
-                elif metric == "rainfall" and value is not None:
-                    weather_data["rainfall"] = f"{value} mm"
-                elif metric == "wind_speed" and value is not None:
-                    weather_data["wind_speed"] = f"{value} km/h"
+    for task in not_done:
+        task.cancel()
+    if not_done:
+        await asyncio.gather(*not_done, return_exceptions=True)
 
-            except Exception as e:
-                weather_data[metric] = "N/A"
+    for task in done:
+        metric, value = task.result()
+        weather_data[metric] = value
 
-    result = f"Weather in Singapore now:\n"
-    result += f"Temperature: {weather_data.get('temperature', 'N/A')}\n"
-    result += f"Humidity: {weather_data.get('humidity', 'N/A')}\n"
-    result += f"Rainfall: {weather_data.get('rainfall', 'N/A')}\n"
-    result += f"Wind Speed: {weather_data.get('wind_speed', 'N/A')}"
+    return weather_data
 
-    return result
+
+async def singapore_weather_async(deadline=DEFAULT_DEADLINE) -> str:
+    """
+    Async version of singapore_weather (uncached). Fires all four NEA requests at once.
+
+    Args:
+        deadline: Overall time budget in seconds shared by all requests
+
+    Returns: Weather report string (partial if the deadline was hit)
+    """
+    return format_weather(await fetch_weather_data(deadline))
+
+
+def load_weather_data(deadline=DEFAULT_DEADLINE):
+    """
+    Cache loader: fetch fresh readings, refusing to cache an outage or a
+    partial result. During a background refresh the previous complete
+    readings stay in the cache, so a slow endpoint does not show as N/A.
+
+    Raises:
+        PartialReadingsError: Some metrics are missing (carries the rest)
+        RuntimeError: No metric arrived
+    """
+    weather_data = run_sync(fetch_weather_data(deadline))
+    readings = [weather_data.get(metric, "N/A") for metric in API_ENDPOINTS]
+
+    if all(value == "N/A" for value in readings):
+        raise RuntimeError("No weather readings available from NEA")
+    if "N/A" in readings:
+        raise PartialReadingsError(weather_data)
+
+    return weather_data
+
+
+def singapore_weather(deadline=DEFAULT_DEADLINE, use_cache=True) -> str:
+    """
+    Returns Singapore weather information using NEA's API. For reference we are using weather station: S111: Scotts Road, failing which, we use S50: Clementi.
+    1. Temperature: https://api-open.data.gov.sg/v2/real-time/api/air-temperature
+    2. Relative humidity: https://api-open.data.gov.sg/v2/real-time/api/relative-humidity
+    3. Rainfall: https://api-open.data.gov.sg/v2/real-time/api/rainfall
+    4. Wind: https://api-open.data.gov.sg/v2/real-time/api/wind-speed
+
+    All four endpoints are fetched concurrently and the call takes at most
+    `deadline` seconds. Readings are served from WEATHER_CACHE unless
+    `use_cache` is False.
+    """
+    if not use_cache:
+        return run_sync(singapore_weather_async(deadline))
+
+    try:
+        weather_data = WEATHER_CACHE.get("singapore", lambda: load_weather_data(deadline))
+    except PartialReadingsError as e:
+        weather_data = e.weather_data
+    except Exception:
+        weather_data = {}
+
+    return format_weather(weather_data)
+
+
+def weather_cache_stats():
+    """
+    Returns: Hit/stale/miss/refresh counters for the shared weather cache
+    """
+    return WEATHER_CACHE.stats()
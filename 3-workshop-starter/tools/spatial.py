@@ -0,0 +1,214 @@
+"""
+Grid spatial index for points of interest.
+
+POIs are bucketed into a uniform lat/lon grid once per catalog, best-rated
+first within each cell. A radius query only looks at the cells overlapping the
+circle's bounding box. Cells that lie wholly inside the circle only contribute
+their best-rated few (ties included); cells on the circle's edge get a
+vectorized haversine over all their POIs. The best-rated matches are then
+picked with one sort.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_CELL_KM = 1.0
+# Queries whose bounding box holds more POIs than this skip the distance
+# check on cells wholly inside the circle
+PRUNE_MIN_CANDIDATES = 4096
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in km. Works on scalars or NumPy arrays (degrees).
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class PoiIndex:
+    """
+    Radius + top-N-by-rating queries over a fixed list of POIs.
+
+    Args:
+        pois: Dicts with at least "lat", "lon" and "rating"
+        cell_km: Grid cell size; about the typical query radius or smaller
+    """
+
+    def __init__(self, pois: List[Dict[str, Any]], cell_km: float = DEFAULT_CELL_KM):
+        self.pois = pois
+        self.cell_deg = cell_km / 111.32  # km per degree of latitude
+
+        lat = np.fromiter((p["lat"] for p in pois), dtype=np.float64, count=len(pois))
+        lon = np.fromiter((p["lon"] for p in pois), dtype=np.float64, count=len(pois))
+        rating = np.fromiter((p.get("rating", 0.0) for p in pois), dtype=np.float64, count=len(pois))
+
+        # Sort by cell so every cell is one contiguous slice of the arrays,
+        # best-rated first within the cell
+        rows = np.floor(lat / self.cell_deg).astype(np.int64)
+        cols = np.floor(lon / self.cell_deg).astype(np.int64)
+        order = np.lexsort((-rating, cols, rows))
+
+        self.order = order
+        self.lat, self.lon, self.rating = lat[order], lon[order], rating[order]
+        rows, cols = rows[order], cols[order]
+
+        # One entry per populated cell, in (row, col) order. A cell's key is
+        # row * width + col offset, so the keys are sorted and a run of columns
+        # in one row is found with two binary searches.
+        empty = np.empty(0, dtype=np.int64)
+        self.cell_rows = self.cell_cols = self.cell_starts = self.cell_ends = self.cell_keys = empty
+        self._col_min, self._width = 0, 1
+        if len(order):
+            boundaries = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 0)) + 1
+            self.cell_starts = np.concatenate(([0], boundaries))
+            self.cell_ends = np.concatenate((boundaries, [len(order)]))
+            self.cell_rows, self.cell_cols = rows[self.cell_starts], cols[self.cell_starts]
+            self._col_min = int(cols.min())
+            self._width = int(cols.max()) - self._col_min + 1
+            self.cell_keys = self.cell_rows * self._width + (self.cell_cols - self._col_min)
+
+    def __len__(self):
+        return len(self.pois)
+
+    def _cells(self, lat, lon, radius_km):
+        """
+        Returns: (rows, cols, starts, ends) of the populated cells overlapping
+            the query's bounding box
+        """
+        if not len(self.cell_keys):
+            return self.cell_rows, self.cell_cols, self.cell_starts, self.cell_ends
+        dlat = radius_km / 111.32
+        dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 1e-6))
+
+        # Clip the box to the populated rows and columns
+        row_lo = max(math.floor((lat - dlat) / self.cell_deg), int(self.cell_rows[0]))
+        row_hi = min(math.floor((lat + dlat) / self.cell_deg), int(self.cell_rows[-1]))
+        col_lo = max(math.floor((lon - dlon) / self.cell_deg) - self._col_min, 0)
+        col_hi = min(math.floor((lon + dlon) / self.cell_deg) - self._col_min, self._width - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return self.cell_rows[:0], self.cell_cols[:0], self.cell_starts[:0], self.cell_ends[:0]
+
+        row_keys = np.arange(row_lo, row_hi + 1) * self._width
+        first = np.searchsorted(self.cell_keys, row_keys + col_lo, side="left")
+        last = np.searchsorted(self.cell_keys, row_keys + col_hi, side="right")
+        cells = _spans(first, last - first)
+        return self.cell_rows[cells], self.cell_cols[cells], self.cell_starts[cells], self.cell_ends[cells]
+
+    def query(self, lat: float, lon: float, radius_km: float, top_n: int) -> List[Dict[str, Any]]:
+        """
+        Best-rated POIs within radius_km of (lat, lon), closest first on ties.
+
+        Returns:
+            Up to top_n copies of the POI dicts with "distance_km" added
+        """
+        if top_n <= 0 or not len(self.pois):
+            return []
+
+        rows, cols, starts, ends = self._cells(lat, lon, radius_km)
+        if not len(starts):
+            return []
+
+        if (ends - starts).sum() <= PRUNE_MIN_CANDIDATES:
+            positions = _spans(starts, ends - starts)
+        else:
+            positions = self._prune(lat, lon, radius_km, top_n, rows, cols, starts, ends)
+
+        distances = haversine_km(lat, lon, self.lat[positions], self.lon[positions])
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+        ratings = self.rating[positions]
+
+        # Large result sets: drop everything rated below the top_n-th rating
+        # (ties kept) in one vectorized pass, so the sort only sees a handful
+        if len(ratings) > 4 * top_n:
+            keep = ratings >= np.partition(ratings, -top_n)[-top_n]
+            positions, distances, ratings = positions[keep], distances[keep], ratings[keep]
+
+        # Best-rated first, closest first on ties
+        results = []
+        for k in np.lexsort((distances, -ratings))[:top_n]:
+            poi = dict(self.pois[self.order[positions[k]]])
+            poi["distance_km"] = round(float(distances[k]), 3)
+            results.append(poi)
+        return results
+
+    def _prune(self, lat, lon, radius_km, top_n, rows, cols, starts, ends):
+        """
+        Positions that can still be in the answer, without a distance check on
+        the cells wholly inside the circle.
+        """
+        # A cell is inside the circle if its farthest corner is, and skipped
+        # if its nearest point is clearly beyond the radius
+        lat_lo, lon_lo = rows * self.cell_deg, cols * self.cell_deg
+        lat_hi, lon_hi = lat_lo + self.cell_deg, lon_lo + self.cell_deg
+        far_lat = np.where(lat - lat_lo > lat_hi - lat, lat_lo, lat_hi)
+        far_lon = np.where(lon - lon_lo > lon_hi - lon, lon_lo, lon_hi)
+        near = haversine_km(lat, lon, np.clip(lat, lat_lo, lat_hi), np.clip(lon, lon_lo, lon_hi))
+        inside = haversine_km(lat, lon, far_lat, far_lon) < radius_km
+        edge_cells = ~inside & (near <= radius_km * (1 + 1e-6) + 1e-6)
+
+        # Edge cells: every POI, filtered by distance
+        edge = _spans(starts[edge_cells], ends[edge_cells] - starts[edge_cells])
+        edge = edge[haversine_km(lat, lon, self.lat[edge], self.lon[edge]) <= radius_km]
+
+        # Inside cells: only the best-rated top_n of each can be in the answer
+        in_starts, in_sizes = starts[inside], ends[inside] - starts[inside]
+        positions = np.concatenate((_spans(in_starts, np.minimum(in_sizes, top_n)), edge))
+        if len(positions) < top_n:
+            return positions
+
+        threshold = np.partition(self.rating[positions], -top_n)[-top_n]
+        # Cells cut at the threshold rating may hold more POIs with that
+        # rating, which compete on distance
+        big = np.flatnonzero(in_sizes > top_n)
+        cut = big[self.rating[in_starts[big] + top_n - 1] >= threshold]
+        extra = []
+        for cell in cut:
+            rest = -self.rating[in_starts[cell] + top_n:in_starts[cell] + in_sizes[cell]]
+            count = int(np.searchsorted(rest, -threshold, side="right"))
+            extra.append(np.arange(in_starts[cell] + top_n, in_starts[cell] + top_n + count))
+        positions = np.concatenate([positions] + extra)
+        return positions[self.rating[positions] >= threshold]
+
+
+def _spans(starts, lengths):
+    """
+    Returns: The positions start..start+length-1 of every span, concatenated
+    """
+    lengths = lengths.astype(np.int64)
+    offsets = starts - np.cumsum(lengths) + lengths
+    return np.repeat(offsets, lengths) + np.arange(lengths.sum())
+
+
+def brute_force_query(pois, lat, lon, radius_km, top_n) -> List[Dict[str, Any]]:
+    """
+    Reference implementation without an index: a full scan in plain Python.
+    """
+    found = []
+    for poi in pois:
+        distance = float(haversine_km(lat, lon, poi["lat"], poi["lon"]))
+        if distance <= radius_km:
+            found.append((poi.get("rating", 0.0), -distance, poi))
+    found.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [dict(poi, distance_km=round(-d, 3)) for _, d, poi in found[:top_n]]
+
+
+def suggest_cell_km(pois: Optional[List[Dict[str, Any]]], target_per_cell: int = 32) -> float:
+    """
+    Pick a cell size that puts roughly `target_per_cell` POIs in an occupied cell.
+    """
+    if not pois or len(pois) <= target_per_cell:
+        return DEFAULT_CELL_KM * 10
+
+    lats = [p["lat"] for p in pois]
+    lons = [p["lon"] for p in pois]
+    height_km = (max(lats) - min(lats)) * 111.32
+    width_km = (max(lons) - min(lons)) * 111.32 * math.cos(math.radians(sum(lats) / len(lats)))
+    area = max(height_km * width_km, 1e-6)
+    return max(0.05, math.sqrt(area * target_per_cell / len(pois)))
@@ -1,60 +1,280 @@
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+"""
+Simulated weather forecasts, generated with NumPy and cached per grid cell and day.
+
+Points are snapped to a lat/lon grid of WEATHER_CELL_KM cells, and every
+(cell, date) gets one forecast. Each value is a fixed function of the seed, the
+cell and the date: a counter-based hash turned into uniforms. So the same
+trip gives the same forecast whichever days were generated first, and a run
+can be reproduced by setting WEATHER_SEED. When it is unset, recorded and
+replayed sessions use RECORD_SEED, so their forecasts match too.
+
+Generated days are kept per cell in arrays indexed by date. Overlapping trips
+to the same city only generate the days they don't share. At most
+WEATHER_CACHE_CELLS cells are kept (least recently used are dropped).
+"""
+
+import os
 import random
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from record_replay import RECORD_MODE, RECORD_SEED
+from tracing import traced
+
+
+WEATHER_SEED = os.getenv("WEATHER_SEED")  # unset: RECORD_SEED when recording/replaying, else drawn from random
+WEATHER_CELL_KM = float(os.getenv("WEATHER_CELL_KM", "10"))
+WEATHER_CACHE_CELLS = int(os.getenv("WEATHER_CACHE_CELLS", "4096"))
+
+WEATHER_CODES = ["clear", "partly_cloudy", "cloudy", "rain", "heavy_rain"]
+
+# Seasonal ranges for Kyoto: (high lo, high hi, low lo, low hi, precip lo, precip hi)
+SEASONS = np.array([
+    (8, 15, 1, 7, 0.2, 0.4),  # winter
+    (18, 25, 10, 17, 0.1, 0.3),  # spring / fall
+    (28, 35, 20, 25, 0.3, 0.7)  # summer (rainy season)
+], dtype=np.float64)
+MONTH_SEASON = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 1, 1, 1, 0])  # month (1-12) -> SEASONS row
+
+FIELDS = ("temperature_max", "temperature_min", "precipitation_probability", "weather_code")
+_EPOCH = date(1970, 1, 1).toordinal()
+_GROW_DAYS = 64  # extra days allocated when a cell's range grows
+
+
+def _mix(x):
+    """
+    splitmix64 finalizer: uint64 array -> well-mixed uint64 array.
+    """
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class _CellDays:
+    """
+    Generated forecasts for one grid cell, one row per date from `start`.
+    """
+
+    __slots__ = ("start", "values", "filled")
+
+    def __init__(self, start, days):
+        self.start = start
+        self.values = np.zeros((days, len(FIELDS)), dtype=np.float64)
+        self.filled = np.zeros(days, dtype=bool)
+
+    def cover(self, first, last):
+        """
+        Grow the arrays to hold dates first..last (ordinals).
+        """
+        end = self.start + len(self.filled)
+        if first >= self.start and last < end:
+            return
+        new_start = min(self.start, first - _GROW_DAYS if first < self.start else first)
+        new_end = max(end, last + 1 + _GROW_DAYS if last >= end else last + 1)
+        values = np.zeros((new_end - new_start, len(FIELDS)), dtype=np.float64)
+        filled = np.zeros(new_end - new_start, dtype=bool)
+        offset = self.start - new_start
+        values[offset:offset + len(self.filled)] = self.values
+        filled[offset:offset + len(self.filled)] = self.filled
+        self.start, self.values, self.filled = new_start, values, filled
+
+
+class WeatherGenerator:
+    """
+    Vectorized forecast generator with a per-(cell, date) cache.
+
+    Args:
+        seed: Integer seed; the same seed always gives the same forecasts.
+            Drawn from the random module when None
+        cell_km: Grid cell size; points in one cell share a forecast
+        max_cells: Cells kept in the cache before the least recently used go
+    """
+
+    def __init__(self, seed: Optional[int] = None, cell_km: float = WEATHER_CELL_KM,
+                 max_cells: int = WEATHER_CACHE_CELLS):
+        self.seed = random.getrandbits(63) if seed is None else int(seed)
+        self.cell_deg = cell_km / 111.32  # km per degree of latitude
+        self.max_cells = max_cells
+        self._cells = OrderedDict()  # (row, col) -> _CellDays
+        self._lock = threading.Lock()
+        self._stats = {"days_cached": 0, "days_generated": 0}
+
+    def generate(self, rows, cols, ordinals) -> np.ndarray:
+        """
+        Forecasts for matching arrays of cell rows, cell cols and date ordinals.
+
+        Returns: (n, 4) array of FIELDS, weather_code as an index into WEATHER_CODES
+        """
+        rows = np.asarray(rows, dtype=np.int64).astype(np.uint64)
+        cols = np.asarray(cols, dtype=np.int64).astype(np.uint64)
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+
+        key = _mix(np.uint64(self.seed) ^ _mix(rows) ^ _mix(cols * np.uint64(3) + _mix(ordinals.astype(np.uint64))))
+        # Four independent uniforms in [0, 1) per (cell, date)
+        streams = _mix(key[:, None] + np.arange(1, 5, dtype=np.uint64))
+        u = (streams >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+        months = (ordinals - _EPOCH).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12 + 1
+        ranges = SEASONS[MONTH_SEASON[months]]
+
+        out = np.empty((len(ordinals), len(FIELDS)), dtype=np.float64)
+        out[:, 0] = np.round(ranges[:, 0] + u[:, 0] * (ranges[:, 1] - ranges[:, 0]), 1)
+        out[:, 1] = np.round(ranges[:, 2] + u[:, 1] * (ranges[:, 3] - ranges[:, 2]), 1)
+        out[:, 2] = np.round(ranges[:, 4] + u[:, 2] * (ranges[:, 5] - ranges[:, 4]), 2)
+        out[:, 3] = np.floor(u[:, 3] * len(WEATHER_CODES))
+        return out
 
+    def cells(self, lats, lons):
+        """
+        Returns: (rows, cols) grid cells of the points
+        """
+        rows = np.floor(np.asarray(lats, dtype=np.float64) / self.cell_deg).astype(np.int64)
+        cols = np.floor(np.asarray(lons, dtype=np.float64) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def forecast(self, lats: Sequence[float], lons: Sequence[float],
+                 start: date, end: date) -> np.ndarray:
+        """
+        Forecasts for every point and every date from start to end (inclusive).
+
+        Returns: (points, days, 4) array of FIELDS
+        """
+        days = (end - start).days + 1
+        if days <= 0:
+            raise ValueError("end_date must not be before start_date")
+        first, last = start.toordinal(), end.toordinal()
+
+        rows, cols = self.cells(np.atleast_1d(lats), np.atleast_1d(lons))
+        if len(rows) == 1:
+            cells, inverse = np.stack((rows, cols), axis=1), np.zeros(1, dtype=np.int64)
+        else:
+            cells, inverse = np.unique(np.stack((rows, cols), axis=1), axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+
+        with self._lock:
+            # Find the (cell, date) pairs nobody has generated yet
+            entries, missing = [], []
+            for index, (row, col) in enumerate(cells.tolist()):
+                entry = self._cells.get((row, col))
+                if entry is None:
+                    entry = self._cells[(row, col)] = _CellDays(first, days)
+                else:
+                    self._cells.move_to_end((row, col))
+                entry.cover(first, last)
+                offset = first - entry.start
+                gaps = np.flatnonzero(~entry.filled[offset:offset + days])
+                entries.append((entry, offset))
+                if len(gaps):
+                    missing.append((index, gaps))
+
+            # Generate all of them in one vectorized call
+            generated = sum(len(gaps) for _, gaps in missing)
+            if generated:
+                cell_index = np.concatenate([np.full(len(gaps), index) for index, gaps in missing])
+                day_index = np.concatenate([gaps for _, gaps in missing])
+                values = self.generate(cells[cell_index, 0], cells[cell_index, 1], first + day_index)
+                done = 0
+                for index, gaps in missing:
+                    entry, offset = entries[index]
+                    entry.values[offset + gaps] = values[done:done + len(gaps)]
+                    entry.filled[offset + gaps] = True
+                    done += len(gaps)
+
+            block = np.stack([entry.values[offset:offset + days] for entry, offset in entries])
+            self._stats["days_generated"] += generated
+            self._stats["days_cached"] += len(cells) * days - generated
+
+            while len(self._cells) > self.max_cells:
+                self._cells.popitem(last=False)
+
+        return block[inverse]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns: (cell, date) forecasts served from the cache and freshly generated
+        """
+        with self._lock:
+            return dict(self._stats, cells=len(self._cells))
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_weather_generator() -> WeatherGenerator:
+    """
+    Returns: The process-wide generator, seeded from WEATHER_SEED if set,
+        else from RECORD_SEED when recording or replaying
+    """
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            if WEATHER_SEED:
+                seed = int(WEATHER_SEED)
+            elif RECORD_MODE in ("record", "replay"):
+                seed = RECORD_SEED
+            else:
+                seed = None
+            _generator = WeatherGenerator(seed=seed)
+        return _generator
+
+
+def _daily(values: np.ndarray, start: date):
+    return [
+        {
+            "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "temperature_max": high,
+            "temperature_min": low,
+            "precipitation_probability": precip,
+            "weather_code": WEATHER_CODES[int(code)]
+        }
+        for i, (high, low, precip, code) in enumerate(values.tolist())
+    ]
+
+
+def get_weather_many(points: Sequence[Sequence[float]], start_date: str, end_date: str) -> np.ndarray:
+    """
+    Forecasts for many (lat, lon) points in one call.
+
+    Args:
+        points: (lat, lon) pairs
+        start_date: Start date (ISO format: YYYY-MM-DD)
+        end_date: End date (ISO format: YYYY-MM-DD)
+
+    Returns:
+        (points, days, 4) array of FIELDS; weather_code indexes WEATHER_CODES
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    start = datetime.fromisoformat(start_date).date()
+    end = datetime.fromisoformat(end_date).date()
+    return get_weather_generator().forecast(points[:, 0], points[:, 1], start, end)
+
+
+@traced("tool.get_weather")
 def get_weather(lat: float, lon: float, start_date: str, end_date: str) -> Dict[str, Any]:
     """
     Simulated weather forecast using Open-Meteo-like API.
-    
+
     Args:
         lat: Latitude
         lon: Longitude
         start_date: Start date (ISO format: YYYY-MM-DD)
         end_date: End date (ISO format: YYYY-MM-DD)
-    
+
     Returns:
         Dict with daily weather forecasts
     """
-    # Parse dates
-    start = datetime.fromisoformat(start_date)
-    end = datetime.fromisoformat(end_date)
-    days = (end - start).days + 1
-    
-    # Generate simulated forecasts
-    daily = []
-    for i in range(days):
-        date = start + timedelta(days=i)
-        
-        # Simulate seasonal weather for Kyoto
-        if date.month in [6, 7, 8]:  # Summer
-            temp_high = random.uniform(28, 35)
-            temp_low = random.uniform(20, 25)
-            precip_prob = random.uniform(0.3, 0.7)  # Rainy season
-        elif date.month in [12, 1, 2]:  # Winter
-            temp_high = random.uniform(8, 15)
-            temp_low = random.uniform(1, 7)
-            precip_prob = random.uniform(0.2, 0.4)
-        else:  # Spring/Fall
-            temp_high = random.uniform(18, 25)
-            temp_low = random.uniform(10, 17)
-            precip_prob = random.uniform(0.1, 0.3)
-            
-        daily.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "temperature_max": round(temp_high, 1),
-            "temperature_min": round(temp_low, 1),
-            "precipitation_probability": round(precip_prob, 2),
-            "weather_code": random.choice([
-                "clear",
-                "partly_cloudy",
-                "cloudy",
-                "rain",
-                "heavy_rain"
-            ])
-        })
-    
+    start = datetime.fromisoformat(start_date).date()
+    end = datetime.fromisoformat(end_date).date()
+    values = get_weather_generator().forecast([lat], [lon], start, end)[0]
+
     return {
         "latitude": lat,
         "longitude": lon,
-        "daily": daily
-    }
\ No newline at end of file
+        "daily": _daily(values, start)
+    }
@@ -0,0 +1,277 @@
+"""
+Lightweight tracing: timed spans with parent/child links.
+
+TRACE=true records a span for every session, graph node, simulated tool call
+and LLM invoke, and appends each finished span to TRACE_FILE. TRACE_FORMAT picks the line format:
+
+    jsonl   One flat span per line (default)
+    otlp    One OTLP/JSON ExportTraceServiceRequest per line, as written by the
+            OpenTelemetry Collector file exporter
+
+Spans nest through a context variable, so children are linked to the span that
+was open when they started, including across dispatch.run_concurrently threads.
+Print a session timeline from a file in either format with:
+
+    python -m tracing [trace.jsonl]
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+TRACE = os.getenv("TRACE", "false").lower() == "true"
+TRACE_FILE = os.getenv("TRACE_FILE", "trace.jsonl")
+TRACE_FORMAT = os.getenv("TRACE_FORMAT", "jsonl").lower()  # jsonl | otlp
+
+SERVICE_NAME = "travel-agent"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    One timed operation. Attributes can be added until the span ends.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class _NoopSpan:
+    """Stands in for Span when tracing is off."""
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(span):
+    """
+    Returns: The span as an OTLP/JSON ExportTraceServiceRequest
+    """
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = span.parent_id
+
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "tracing"}, "spans": [otlp_span]}]
+    }]}
+
+
+class SpanExporter:
+    """
+    Appends finished spans to a file, one JSON object per line.
+    """
+
+    def __init__(self, path=TRACE_FILE, fmt=TRACE_FORMAT):
+        self.format = fmt
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        data = to_otlp(span) if self.format == "otlp" else span.to_dict()
+        line = json.dumps(data, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            # Flush at the end of every trace so a crashed session keeps its spans
+            if span.parent_id is None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """
+    Returns: The process-wide SpanExporter, or None when TRACE is off
+    """
+    global _exporter
+    if not TRACE:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = SpanExporter()
+            atexit.register(_exporter.close)
+        return _exporter
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time the enclosed block as a child of the current span.
+
+    Yields: The Span (or a no-op stand-in when tracing is off); call
+    .set(key=value) on it to attach results such as token counts.
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        yield NOOP_SPAN
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(current)
+
+
+def traced(name):
+    """
+    Decorator form of span() for graph nodes and tools.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _attribute_value(value):
+    for kind in ("boolValue", "doubleValue", "stringValue"):
+        if kind in value:
+            return value[kind]
+    return int(value["intValue"]) if "intValue" in value else None
+
+
+def from_otlp(request):
+    """
+    Returns: The spans in an OTLP/JSON ExportTraceServiceRequest, as to_dict() dicts
+    """
+    spans = []
+    for resource in request.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for s in scope.get("spans", []):
+                start_ns, end_ns = int(s["startTimeUnixNano"]), int(s["endTimeUnixNano"])
+                status = s.get("status", {})
+                spans.append({
+                    "name": s["name"],
+                    "trace_id": s["traceId"],
+                    "span_id": s["spanId"],
+                    "parent_id": s.get("parentSpanId") or None,
+                    "start_ns": start_ns,
+                    "end_ns": end_ns,
+                    "duration_ms": round((end_ns - start_ns) / 1e6, 3),
+                    "attributes": {a["key"]: _attribute_value(a["value"]) for a in s.get("attributes", [])},
+                    "error": status.get("message") if status.get("code") == 2 else None
+                })
+    return spans
+
+
+def load_spans(path=TRACE_FILE):
+    """
+    Read a trace file written with either TRACE_FORMAT.
+
+    Returns: Span dicts in the jsonl (to_dict()) layout
+    Raises: ValueError for lines that are neither format
+    """
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "resourceSpans" in record:
+                spans.extend(from_otlp(record))
+            elif "span_id" in record:
+                spans.append(record)
+            else:
+                raise ValueError(f"{path}:{number} is not a jsonl or otlp span")
+    return spans
+
+
+def print_timeline(path=TRACE_FILE):
+    """
+    Print every trace in a trace file (jsonl or otlp) as an indented tree of spans.
+    """
+    spans = load_spans(path)
+
+    children = {}
+    for s in spans:
+        children.setdefault(s["parent_id"], []).append(s)
+
+    def show(s, depth, origin):
+        offset = (s["start_ns"] - origin) / 1e6
+        status = "  !" + s["error"] if s["error"] else ""
+        print(f"{offset:>9.1f} ms  {'  ' * depth}{s['name']} ({s['duration_ms']:.1f} ms){status}")
+        for child in sorted(children.get(s["span_id"], []), key=lambda c: c["start_ns"]):
+            show(child, depth + 1, origin)
+
+    for root in sorted(children.get(None, []), key=lambda r: r["start_ns"]):
+        print(f"\ntrace {root['trace_id']}")
+        show(root, 0, root["start_ns"])
+
+
+if __name__ == "__main__":
+    print_timeline(sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE)